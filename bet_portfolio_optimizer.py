@@ -0,0 +1,353 @@
+"""
+Fractional-Kelly bankroll allocation over a week's candidate bets.
+
+The best-bets lists rank by confidence_score alone; nothing sizes the bets or
+accounts for a spread, a total and several props all riding on the same game.
+This script loads every recommended spread, total and player prop for a week,
+converts confidence and price into an expected return per unit staked, and
+allocates stakes with a correlation-aware (multivariate Gaussian) Kelly
+criterion:
+
+    f = KELLY_FRACTION * inverse(Cov) @ edge      solved per game block
+
+followed by per-bet, per-game, per-team and total exposure caps. Bets in
+different games are treated as independent, so the covariance is block
+diagonal and each game is solved on its own. Everything after loading is
+array math, so a slate with thousands of props sizes in milliseconds.
+
+Usage:
+    python bet_portfolio_optimizer.py --week 11 --season 2025 --bankroll 1000
+    python bet_portfolio_optimizer.py --week 11 --season 2025 --output allocations.csv
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from postgrest.exceptions import APIError
+from supabase import create_client, Client
+
+load_dotenv()
+
+# Fraction of full Kelly to stake (full Kelly is far too aggressive for model edges)
+KELLY_FRACTION = 0.25
+
+# Confidence score (0-100) -> win probability: 50 is a coin flip, each point adds 0.4%
+CONFIDENCE_SLOPE = 0.004
+MAX_WIN_PROBABILITY = 0.75
+
+# Default American price when a market has no stored price (standard spread/total juice)
+STANDARD_PRICE = -110
+
+# Exposure caps as fractions of bankroll
+MAX_BET_FRACTION = 0.03
+MAX_GAME_EXPOSURE = 0.06
+MAX_TEAM_EXPOSURE = 0.08
+MAX_TOTAL_EXPOSURE = 0.30
+
+# Stakes below this fraction of bankroll are dropped
+MIN_BET_FRACTION = 0.001
+
+# Outcome correlations between bets on the same game, by market kind.
+# Direction is ignored, so these are deliberately conservative (positive).
+KINDS = ['spread', 'total', 'prop']
+KIND_CORRELATION = np.array([
+    #  spread total  prop
+    [1.00, 0.15, 0.10],  # spread
+    [0.15, 1.00, 0.20],  # total
+    [0.10, 0.20, 0.10],  # prop
+])
+SAME_TEAM_CORRELATION = 0.25   # spread/prop or prop/prop on the same team
+SAME_PLAYER_CORRELATION = 0.60  # two props on one player (yards and receptions)
+
+# Odds API full team names -> PFR abbreviations (matches predictPlayerProps.ts)
+TEAM_ABBR_MAP = {
+    'Arizona Cardinals': 'ARI', 'Atlanta Falcons': 'ATL', 'Baltimore Ravens': 'BAL',
+    'Buffalo Bills': 'BUF', 'Carolina Panthers': 'CAR', 'Chicago Bears': 'CHI',
+    'Cincinnati Bengals': 'CIN', 'Cleveland Browns': 'CLE', 'Dallas Cowboys': 'DAL',
+    'Denver Broncos': 'DEN', 'Detroit Lions': 'DET', 'Green Bay Packers': 'GNB',
+    'Houston Texans': 'HOU', 'Indianapolis Colts': 'IND', 'Jacksonville Jaguars': 'JAX',
+    'Kansas City Chiefs': 'KAN', 'Las Vegas Raiders': 'LVR', 'Los Angeles Chargers': 'LAC',
+    'Los Angeles Rams': 'LAR', 'Miami Dolphins': 'MIA', 'Minnesota Vikings': 'MIN',
+    'New England Patriots': 'NWE', 'New Orleans Saints': 'NOR', 'New York Giants': 'NYG',
+    'New York Jets': 'NYJ', 'Philadelphia Eagles': 'PHI', 'Pittsburgh Steelers': 'PIT',
+    'San Francisco 49ers': 'SFO', 'Seattle Seahawks': 'SEA', 'Tampa Bay Buccaneers': 'TAM',
+    'Tennessee Titans': 'TEN', 'Washington Commanders': 'WAS',
+}
+
+CANDIDATE_COLUMNS = ['kind', 'label', 'game', 'team', 'opponent', 'player', 'confidence', 'price']
+
+PAGE_SIZE = 1000
+
+
+def get_supabase_client() -> Client:
+    """Initialize Supabase client"""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise Exception('Missing Supabase credentials in .env file')
+
+    return create_client(url, key)
+
+
+def fetch_all(build_query) -> List[Dict[str, object]]:
+    """Page through a PostgREST query until it returns a short page."""
+    rows: List[Dict[str, object]] = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+def game_key(team_a: str, team_b: str) -> str:
+    """Order-independent game identifier from two PFR abbreviations."""
+    return '@'.join(sorted([team_a or '', team_b or '']))
+
+
+# ---------------------------------------------------------------------------
+# Candidate loading
+# ---------------------------------------------------------------------------
+
+def load_spread_candidates(client: Client, week: int, season: int) -> pd.DataFrame:
+    """Recommended spread/moneyline picks from predictions (or spread_predictions)."""
+    def query(table: str):
+        return lambda: client.table(table)\
+            .select('recommended_bet, confidence_score, odds_bets:game_id (home_team, away_team, home_spread, away_spread, home_price, away_price)')\
+            .neq('recommended_bet', 'none')\
+            .eq('week_number', week)\
+            .eq('season', season)
+
+    try:
+        rows = fetch_all(query('predictions'))
+    except APIError as e:
+        # Fall back only when the table does not exist (as predictGames does)
+        if e.code != 'PGRST205':
+            raise
+        rows = fetch_all(query('spread_predictions'))
+
+    records = []
+    for row in rows:
+        game = row.get('odds_bets') or {}
+        home = TEAM_ABBR_MAP.get(game.get('home_team'), game.get('home_team'))
+        away = TEAM_ABBR_MAP.get(game.get('away_team'), game.get('away_team'))
+        bet = row.get('recommended_bet') or ''
+        is_home = bet.startswith('home')
+        team, opponent = (home, away) if is_home else (away, home)
+        if bet.endswith('_ml'):
+            price = game.get('home_price') if is_home else game.get('away_price')
+            label = f"{team} ML ({price})"
+        else:
+            price = STANDARD_PRICE
+            label = f"{team} {game.get('home_spread') if is_home else game.get('away_spread')}"
+        records.append({
+            'kind': 'spread', 'label': label, 'game': game_key(home, away),
+            'team': team, 'opponent': opponent, 'player': None,
+            'confidence': row.get('confidence_score'), 'price': price,
+        })
+    return pd.DataFrame(records, columns=CANDIDATE_COLUMNS)
+
+
+def load_totals_candidates(client: Client, week: int, season: int) -> pd.DataFrame:
+    """Recommended Over/Under picks from totals_predictions."""
+    rows = fetch_all(lambda: client.table('totals_predictions')
+        .select('home_team, away_team, vegas_total, recommended_bet, confidence_score, over_price, under_price')
+        .not_.is_('recommended_bet', 'null')
+        .eq('week_number', week)
+        .eq('season', season))
+
+    df = pd.DataFrame(rows, columns=['home_team', 'away_team', 'vegas_total', 'recommended_bet',
+                                     'confidence_score', 'over_price', 'under_price'])
+    home = df['home_team'].map(TEAM_ABBR_MAP).fillna(df['home_team'])
+    away = df['away_team'].map(TEAM_ABBR_MAP).fillna(df['away_team'])
+    is_over = df['recommended_bet'] == 'OVER'
+    return pd.DataFrame({
+        'kind': 'total',
+        'label': away + ' @ ' + home + ' ' + df['recommended_bet'] + ' ' + df['vegas_total'].astype(str),
+        'game': [game_key(h, a) for h, a in zip(home, away)],
+        # A total is exposed to both teams; 'team' holds home, 'opponent' away
+        'team': home,
+        'opponent': away,
+        'player': None,
+        'confidence': df['confidence_score'],
+        'price': df['over_price'].where(is_over, df['under_price']),
+    }, columns=CANDIDATE_COLUMNS)
+
+
+def load_prop_candidates(client: Client, week: int, season: int) -> pd.DataFrame:
+    """Recommended player props from player_prop_predictions."""
+    rows = fetch_all(lambda: client.table('player_prop_predictions')
+        .select('player_name, team, opponent, prop_market, prop_line, recommended_bet, confidence_score, odds')
+        .not_.is_('recommended_bet', 'null')
+        .eq('week_number', week)
+        .eq('season', season))
+
+    df = pd.DataFrame(rows, columns=['player_name', 'team', 'opponent', 'prop_market', 'prop_line',
+                                     'recommended_bet', 'confidence_score', 'odds'])
+    return pd.DataFrame({
+        'kind': 'prop',
+        'label': df['player_name'] + ' ' + df['prop_market'] + ' ' + df['recommended_bet'] + ' ' + df['prop_line'].astype(str),
+        'game': [game_key(t, o) for t, o in zip(df['team'], df['opponent'])],
+        'team': df['team'],
+        'opponent': df['opponent'],
+        'player': df['player_name'],
+        'confidence': df['confidence_score'],
+        'price': df['odds'],
+    }, columns=CANDIDATE_COLUMNS)
+
+
+def load_candidates(client: Client, week: int, season: int) -> pd.DataFrame:
+    """Every recommended spread, total and prop for the week in one frame."""
+    frames = [
+        load_spread_candidates(client, week, season),
+        load_totals_candidates(client, week, season),
+        load_prop_candidates(client, week, season),
+    ]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=CANDIDATE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# Optimizer
+# ---------------------------------------------------------------------------
+
+def american_to_net_odds(price: np.ndarray) -> np.ndarray:
+    """Net profit per unit staked for American prices (-110 -> 0.909, +150 -> 1.5)."""
+    return np.where(price > 0, price / 100.0, 100.0 / np.abs(price))
+
+
+def correlation_block(kind: np.ndarray, team: np.ndarray, player: np.ndarray) -> np.ndarray:
+    """Pairwise outcome correlation for bets within one game."""
+    rho = KIND_CORRELATION[kind[:, None], kind[None, :]]
+    same_team = (team[:, None] == team[None, :]) & (kind[:, None] != 1) & (kind[None, :] != 1)
+    rho = np.where(same_team, np.maximum(rho, SAME_TEAM_CORRELATION), rho)
+    has_player = player != ''
+    same_player = has_player[:, None] & (player[:, None] == player[None, :])
+    rho = np.where(same_player, np.maximum(rho, SAME_PLAYER_CORRELATION), rho)
+    np.fill_diagonal(rho, 1.0)
+    return rho
+
+
+def kelly_block(edge: np.ndarray, cov: np.ndarray) -> np.ndarray:
+    """Gaussian multivariate Kelly with a non-negativity active set."""
+    stakes = np.zeros_like(edge)
+    active = edge > 0
+    # Each pass drops at least one bet, so this terminates within len(edge) passes
+    while active.any():
+        idx = np.flatnonzero(active)
+        solved = np.linalg.solve(cov[np.ix_(idx, idx)], edge[idx])
+        if (solved >= 0).all():
+            stakes[idx] = solved
+            break
+        active[idx[solved < 0]] = False
+    return stakes
+
+
+def cap_by_group(stakes: np.ndarray, groups: np.ndarray, cap: float) -> np.ndarray:
+    """Per-bet scale factor so no group's total stake exceeds cap."""
+    totals = np.bincount(groups, weights=stakes)
+    scale = np.minimum(1.0, cap / np.maximum(totals, 1e-12))
+    return scale[groups]
+
+
+def optimize_portfolio(candidates: pd.DataFrame) -> pd.DataFrame:
+    """Allocate bankroll fractions across candidate bets."""
+    df = candidates.reset_index(drop=True).copy()
+    if df.empty:
+        df['stake_fraction'] = []
+        return df
+
+    confidence = pd.to_numeric(df['confidence'], errors='coerce').fillna(50).to_numpy(float)
+    price = pd.to_numeric(df['price'], errors='coerce').fillna(STANDARD_PRICE).to_numpy(float)
+    price = np.where(price == 0, STANDARD_PRICE, price)
+
+    p = np.clip(0.5 + (confidence - 50) * CONFIDENCE_SLOPE, 0.01, MAX_WIN_PROBABILITY)
+    b = american_to_net_odds(price)
+    edge = p * (b + 1) - 1               # expected return per unit staked
+    sigma = (b + 1) * np.sqrt(p * (1 - p))  # stdev of return per unit staked
+
+    kind = df['kind'].map({k: i for i, k in enumerate(KINDS)}).to_numpy(int)
+    team = df['team'].fillna('').astype(str).to_numpy()
+    player = df['player'].fillna('').astype(str).to_numpy()
+    game_codes, game_index = np.unique(df['game'].astype(str).to_numpy(), return_inverse=True)
+
+    # Block-diagonal covariance: solve each game independently
+    stakes = np.zeros(len(df))
+    order = np.argsort(game_index, kind='stable')
+    bounds = np.searchsorted(game_index[order], np.arange(len(game_codes) + 1))
+    for g in range(len(game_codes)):
+        idx = order[bounds[g]:bounds[g + 1]]
+        rho = correlation_block(kind[idx], team[idx], player[idx])
+        # Small ridge keeps the block invertible when the heuristic correlations are not PSD
+        cov = rho * np.outer(sigma[idx], sigma[idx]) + np.eye(len(idx)) * 1e-6
+        stakes[idx] = kelly_block(edge[idx], cov)
+
+    stakes = np.minimum(stakes * KELLY_FRACTION, MAX_BET_FRACTION)
+
+    # Exposure caps: per game, per team (totals count toward both teams), overall
+    stakes *= cap_by_group(stakes, game_index, MAX_GAME_EXPOSURE)
+    team_codes, team_index = np.unique(np.concatenate([team, df['opponent'].fillna('').astype(str).to_numpy()]),
+                                       return_inverse=True)
+    primary, secondary = team_index[:len(df)], team_index[len(df):]
+    is_total = kind == 1
+    team_exposure = np.bincount(primary, weights=stakes, minlength=len(team_codes)) \
+        + np.bincount(secondary, weights=np.where(is_total, stakes, 0.0), minlength=len(team_codes))
+    team_scale = np.minimum(1.0, MAX_TEAM_EXPOSURE / np.maximum(team_exposure, 1e-12))
+    stakes *= np.minimum(team_scale[primary], np.where(is_total, team_scale[secondary], 1.0))
+    stakes *= min(1.0, MAX_TOTAL_EXPOSURE / max(stakes.sum(), 1e-12))
+
+    stakes = np.where(stakes >= MIN_BET_FRACTION, stakes, 0.0)
+
+    df['win_probability'] = p.round(4)
+    df['expected_return'] = edge.round(4)
+    df['stake_fraction'] = stakes.round(5)
+    return df.sort_values('stake_fraction', ascending=False, ignore_index=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Size weekly bets with fractional Kelly')
+    parser.add_argument('--week', type=int, required=True)
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--bankroll', type=float, default=1000.0)
+    parser.add_argument('--output', help='Write the allocation table to this CSV path')
+    args = parser.parse_args(argv)
+
+    try:
+        client = get_supabase_client()
+        candidates = load_candidates(client, args.week, args.season)
+    except Exception as e:
+        print(f"❌ Error loading candidates: {e}")
+        return 1
+
+    started = time.perf_counter()
+    allocation = optimize_portfolio(candidates)
+    elapsed = (time.perf_counter() - started) * 1000
+    allocation['stake'] = (allocation['stake_fraction'] * args.bankroll).round(2)
+
+    staked = allocation[allocation['stake'] > 0]
+    print(f"\n{'='*80}")
+    print(f"Week {args.week} portfolio - {len(candidates)} candidates sized in {elapsed:.0f} ms")
+    print(f"{'='*80}\n")
+    for row in staked.itertuples(index=False):
+        print(f"  ${row.stake:>8.2f}  {row.kind:<6}  {row.label}  (p={row.win_probability:.2f}, EV={row.expected_return:+.3f})")
+    print(f"\n  Total staked: ${staked['stake'].sum():.2f} of ${args.bankroll:.2f} across {len(staked)} bets\n")
+
+    if args.output:
+        allocation.to_csv(args.output, index=False)
+        print(f"  ✅ Wrote {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
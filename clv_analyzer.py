@@ -0,0 +1,400 @@
+"""
+Closing-line value (CLV) report for spread, moneyline and totals picks.
+
+A pick beats the close when the line moved toward it between the time the
+prediction was made and kickoff. odds_bets and totals_odds only hold the
+latest line, so this script reads the odds_snapshots history (populated by
+triggers on both tables) and matches every pick with two as-of joins:
+
+  bet line    latest snapshot for the game at or before the prediction time
+  close line  latest snapshot for the game at or before kickoff
+
+Only SNAPSHOT_BOOKMAKER's snapshots are used, so both lines always come from
+the same book and a difference between books is never counted as CLV.
+
+Both joins are pd.merge_asof over frames sorted once by time, so millions of
+snapshot rows cost a sort and a single merge pass, not a lookup per pick.
+Picks are then graded at the bet line against game_results.
+
+CLV units by market:
+  spread     points gained on our side (bet -3, closes -5 -> +2.0)
+  total      points gained on our side (Over 44.5, closes 46.5 -> +2.0)
+  moneyline  no-vig win probability gained on our side, in percentage points
+
+Usage:
+    python clv_analyzer.py --season 2025
+    python clv_analyzer.py --season 2025 --weeks 9 10 11 --output clv_picks.csv
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from postgrest.exceptions import APIError
+from supabase import create_client, Client
+
+load_dotenv()
+
+# Price assumed for spread/total picks with no stored price (standard juice)
+STANDARD_PRICE = -110
+
+CONFIDENCE_BINS = [0, 55, 60, 65, 70, 75, 80, 101]
+CONFIDENCE_LABELS = ['<55', '55-60', '60-65', '65-70', '70-75', '75-80', '80+']
+
+# Book whose lines the prediction routes use (sync-totals-odds keeps DraftKings only)
+SNAPSHOT_BOOKMAKER = 'DraftKings'
+
+SNAPSHOT_COLUMNS = [
+    'game_id', 'captured_at', 'bookmaker', 'home_spread', 'home_spread_price', 'away_spread_price',
+    'home_ml_price', 'away_ml_price', 'total_line', 'over_price', 'under_price',
+]
+
+# Snapshot columns needed by each market; rows missing them are ignored for that market
+MARKET_COLUMNS: Dict[str, List[str]] = {
+    'spread': ['home_spread', 'home_spread_price', 'away_spread_price'],
+    'moneyline': ['home_ml_price', 'away_ml_price'],
+    'total': ['total_line', 'over_price', 'under_price'],
+}
+
+PICK_COLUMNS = [
+    'model', 'market', 'game_id', 'home_team', 'away_team', 'commence_time', 'week', 'season',
+    'side', 'confidence', 'bet_time', 'recorded_line', 'recorded_price',
+]
+
+PAGE_SIZE = 1000
+
+
+def get_supabase_client() -> Client:
+    """Initialize Supabase client"""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise Exception('Missing Supabase credentials in .env file')
+
+    return create_client(url, key)
+
+
+def fetch_all(build_query) -> List[Dict[str, object]]:
+    """Page through a PostgREST query until it returns a short page."""
+    rows: List[Dict[str, object]] = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+def to_utc(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, utc=True, errors='coerce')
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+def load_spread_picks(client: Client, season: int, weeks: Optional[List[int]]) -> pd.DataFrame:
+    """Spread and moneyline picks from predictions (or spread_predictions)."""
+    def query(table: str):
+        def build():
+            q = client.table(table)\
+                .select('recommended_bet, confidence_score, week_number, season, created_at, updated_at, '
+                        'odds_bets:game_id (api_id, home_team, away_team, commence_time)')\
+                .neq('recommended_bet', 'none')\
+                .eq('season', season)
+            return q.in_('week_number', weeks) if weeks else q
+        return build
+
+    try:
+        rows = fetch_all(query('predictions'))
+    except APIError as e:
+        # Fall back only when the table does not exist (as predictGames does)
+        if e.code != 'PGRST205':
+            raise
+        rows = fetch_all(query('spread_predictions'))
+
+    records = []
+    for row in rows:
+        game = row.get('odds_bets') or {}
+        bet = row.get('recommended_bet') or ''
+        records.append({
+            'model': 'spread_model',
+            'market': 'moneyline' if bet.endswith('_ml') else 'spread',
+            'game_id': game.get('api_id'),
+            'home_team': game.get('home_team'),
+            'away_team': game.get('away_team'),
+            'commence_time': game.get('commence_time'),
+            'week': row.get('week_number'),
+            'season': row.get('season'),
+            'side': 1 if bet.startswith('home') else -1,
+            'confidence': row.get('confidence_score'),
+            # Upserts refresh updated_at, so it is when the current pick was made
+            'bet_time': row.get('updated_at') or row.get('created_at'),
+            'recorded_line': None,
+            'recorded_price': None,
+        })
+    return pd.DataFrame(records, columns=PICK_COLUMNS)
+
+
+def load_totals_picks(client: Client, season: int, weeks: Optional[List[int]]) -> pd.DataFrame:
+    """Over/Under picks from totals_predictions."""
+    def build():
+        q = client.table('totals_predictions')\
+            .select('game_id, home_team, away_team, commence_time, week_number, season, recommended_bet, '
+                    'confidence_score, vegas_total, over_price, under_price, created_at, updated_at')\
+            .not_.is_('recommended_bet', 'null')\
+            .eq('season', season)
+        return q.in_('week_number', weeks) if weeks else q
+
+    df = pd.DataFrame(fetch_all(build), columns=[
+        'game_id', 'home_team', 'away_team', 'commence_time', 'week_number', 'season', 'recommended_bet',
+        'confidence_score', 'vegas_total', 'over_price', 'under_price', 'created_at', 'updated_at',
+    ])
+    is_over = df['recommended_bet'] == 'OVER'
+    return pd.DataFrame({
+        'model': 'totals_model',
+        'market': 'total',
+        'game_id': df['game_id'],
+        'home_team': df['home_team'],
+        'away_team': df['away_team'],
+        'commence_time': df['commence_time'],
+        'week': df['week_number'],
+        'season': df['season'],
+        'side': np.where(is_over, 1, -1),
+        'confidence': df['confidence_score'],
+        'bet_time': df['updated_at'].fillna(df['created_at']),
+        # The total stored with the pick; used when no snapshot predates it
+        'recorded_line': df['vegas_total'],
+        'recorded_price': df['over_price'].where(is_over, df['under_price']),
+    }, columns=PICK_COLUMNS)
+
+
+def load_snapshots(client: Client, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """SNAPSHOT_BOOKMAKER's odds_snapshots for games kicking off in [start, end]."""
+    rows = fetch_all(lambda: client.table('odds_snapshots')
+        .select(', '.join(SNAPSHOT_COLUMNS))
+        .eq('bookmaker', SNAPSHOT_BOOKMAKER)
+        .gte('commence_time', start.isoformat())
+        .lte('commence_time', end.isoformat())
+        .order('id'))
+    snapshots = pd.DataFrame(rows, columns=SNAPSHOT_COLUMNS)
+    snapshots['captured_at'] = to_utc(snapshots['captured_at'])
+    for col in SNAPSHOT_COLUMNS[3:]:
+        snapshots[col] = pd.to_numeric(snapshots[col], errors='coerce')
+    return snapshots
+
+
+def load_results(client: Client, season: int) -> pd.DataFrame:
+    """Final scores from game_results."""
+    rows = fetch_all(lambda: client.table('game_results')
+        .select('home_team, away_team, week_number, season, home_score, away_score, game_status')
+        .eq('season', season))
+    results = pd.DataFrame(rows, columns=['home_team', 'away_team', 'week_number', 'season',
+                                          'home_score', 'away_score', 'game_status'])
+    results = results[results['game_status'].fillna('Final') == 'Final']
+    return results.rename(columns={'week_number': 'week'}).drop(columns='game_status')
+
+
+# ---------------------------------------------------------------------------
+# As-of joins and grading
+# ---------------------------------------------------------------------------
+
+def attach_lines(picks: pd.DataFrame, snapshots: pd.DataFrame, time_column: str, prefix: str,
+                 bookmaker: str = SNAPSHOT_BOOKMAKER) -> pd.DataFrame:
+    """Add each pick's market line as of time_column, one merge_asof per market.
+
+    Snapshots from other books are dropped first so every line comes from bookmaker.
+    """
+    line_columns = ['line', 'price', 'opposite_price']
+    snapshots = snapshots[snapshots['bookmaker'] == bookmaker]
+    parts = []
+    for market, columns in MARKET_COLUMNS.items():
+        market_picks = picks[picks['market'] == market]
+        if market_picks.empty:
+            continue
+        market_snaps = snapshots.dropna(subset=[columns[0]])[['game_id', 'captured_at'] + columns]
+        merged = pd.merge_asof(
+            market_picks.sort_values(time_column),
+            market_snaps.sort_values('captured_at'),
+            left_on=time_column,
+            right_on='captured_at',
+            by='game_id',
+            direction='backward',
+        )
+        home_side = merged['side'] == 1
+        if market == 'spread':
+            merged[prefix + 'line'] = merged['home_spread']
+            merged[prefix + 'price'] = merged['home_spread_price'].where(home_side, merged['away_spread_price'])
+            merged[prefix + 'opposite_price'] = merged['away_spread_price'].where(home_side, merged['home_spread_price'])
+        elif market == 'moneyline':
+            merged[prefix + 'line'] = np.nan
+            merged[prefix + 'price'] = merged['home_ml_price'].where(home_side, merged['away_ml_price'])
+            merged[prefix + 'opposite_price'] = merged['away_ml_price'].where(home_side, merged['home_ml_price'])
+        else:
+            merged[prefix + 'line'] = merged['total_line']
+            merged[prefix + 'price'] = merged['over_price'].where(home_side, merged['under_price'])
+            merged[prefix + 'opposite_price'] = merged['under_price'].where(home_side, merged['over_price'])
+        parts.append(merged[list(picks.columns) + [prefix + c for c in line_columns]])
+
+    if not parts:
+        return picks.assign(**{prefix + c: np.nan for c in line_columns})
+    return pd.concat(parts, ignore_index=True)
+
+
+def american_to_net_odds(price: pd.Series) -> pd.Series:
+    """Net profit per unit staked for American prices (-110 -> 0.909, +150 -> 1.5)."""
+    return pd.Series(np.where(price > 0, price / 100.0, 100.0 / price.abs()), index=price.index)
+
+
+def no_vig_probability(price: pd.Series, opposite_price: pd.Series) -> pd.Series:
+    """Our side's implied win probability with the bookmaker margin removed."""
+    ours = 1 / (1 + american_to_net_odds(price))
+    theirs = 1 / (1 + american_to_net_odds(opposite_price))
+    return ours / (ours + theirs)
+
+
+def grade_picks(picks: pd.DataFrame, results: pd.DataFrame) -> pd.DataFrame:
+    """Compute CLV, the graded outcome at the bet line and profit per unit staked."""
+    df = picks.merge(results, on=['season', 'week', 'home_team', 'away_team'], how='left')
+    numeric = ['side', 'recorded_line', 'recorded_price', 'home_score', 'away_score'] + \
+        [p + c for p in ('bet_', 'close_') for c in ('line', 'price', 'opposite_price')]
+    df[numeric] = df[numeric].apply(pd.to_numeric, errors='coerce')
+
+    # Fall back to the line stored with the pick when no snapshot predates it
+    df['bet_line'] = df['bet_line'].fillna(df['recorded_line'])
+    df['bet_price'] = df['bet_price'].fillna(df['recorded_price'])
+
+    side = df['side']
+    margin = df['home_score'] - df['away_score']
+    total = df['home_score'] + df['away_score']
+
+    is_spread = df['market'] == 'spread'
+    is_total = df['market'] == 'total'
+    is_ml = df['market'] == 'moneyline'
+
+    # Positive = the market moved toward our side after we bet
+    ml_clv = no_vig_probability(df['close_price'], df['close_opposite_price']) \
+        - no_vig_probability(df['bet_price'], df['bet_opposite_price'])
+    df['clv'] = np.select(
+        [is_spread, is_total, is_ml],
+        [side * (df['bet_line'] - df['close_line']), side * (df['close_line'] - df['bet_line']), ml_clv * 100],
+        default=np.nan,
+    ).round(3)
+
+    # Graded value: > 0 win, 0 push, < 0 loss
+    graded = np.select(
+        [is_spread, is_total, is_ml],
+        [side * (margin + df['bet_line']), side * (total - df['bet_line']), side * margin],
+        default=np.nan,
+    )
+    df['result'] = np.select([graded > 0, graded == 0, graded < 0], ['win', 'push', 'loss'], default=None)
+
+    # Spread and total picks without a stored price are graded at standard juice;
+    # a moneyline pick without a price gets no profit figure
+    price = df['bet_price'].where(is_ml, df['bet_price'].fillna(STANDARD_PRICE))
+    df['profit'] = np.select(
+        [df['result'] == 'win', df['result'] == 'push', df['result'] == 'loss'],
+        [american_to_net_odds(price), 0.0, -1.0],
+        default=np.nan,
+    )
+
+    df['confidence_bucket'] = pd.cut(
+        pd.to_numeric(df['confidence'], errors='coerce'),
+        bins=CONFIDENCE_BINS, labels=CONFIDENCE_LABELS, right=False,
+    )
+    return df
+
+
+def summarize(graded: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+    """CLV, hit rate and ROI per group."""
+    df = graded.assign(
+        is_win=graded['result'] == 'win',
+        is_decided=graded['result'].isin(['win', 'loss']),
+        beat_close=(graded['clv'] > 0).where(graded['clv'].notna()),
+        staked=graded['profit'].notna().astype(float),
+    )
+    summary = df.groupby(by, observed=True).agg(
+        picks=('market', 'size'),
+        with_close=('clv', 'count'),
+        avg_clv=('clv', 'mean'),
+        beat_close_rate=('beat_close', 'mean'),
+        wins=('is_win', 'sum'),
+        decided=('is_decided', 'sum'),
+        staked=('staked', 'sum'),
+        profit=('profit', 'sum'),
+    )
+    summary['hit_rate'] = summary['wins'] / summary['decided'].replace(0, np.nan)
+    summary['roi'] = summary['profit'] / summary['staked'].replace(0, np.nan)
+    return summary[['picks', 'with_close', 'avg_clv', 'beat_close_rate', 'hit_rate', 'roi', 'profit']].round(3)
+
+
+def analyze(picks: pd.DataFrame, snapshots: pd.DataFrame, results: pd.DataFrame) -> pd.DataFrame:
+    """As-of join picks to bet-time and closing lines, then grade against results."""
+    picks = picks.copy()
+    picks['bet_time'] = to_utc(picks['bet_time'])
+    picks['commence_time'] = to_utc(picks['commence_time'])
+    picks = picks.dropna(subset=['game_id', 'bet_time', 'commence_time'])
+    # A pick made after kickoff is judged against the close, not a live line
+    picks['bet_time'] = picks[['bet_time', 'commence_time']].min(axis=1)
+
+    with_bet = attach_lines(picks, snapshots, 'bet_time', 'bet_')
+    with_close = attach_lines(with_bet, snapshots, 'commence_time', 'close_')
+    return grade_picks(with_close, results)
+
+
+def print_report(graded: pd.DataFrame) -> None:
+    with pd.option_context('display.width', 160, 'display.max_rows', 200):
+        for title, by in [
+            ('By model', ['model']),
+            ('By market', ['market']),
+            ('By market and confidence', ['market', 'confidence_bucket']),
+        ]:
+            print(f"\n{title}")
+            print('-' * 80)
+            print(summarize(graded, by).to_string())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Closing-line value report for model picks')
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--weeks', type=int, nargs='*', help='Limit to these weeks (default: whole season)')
+    parser.add_argument('--output', help='Also write per-pick rows to this CSV file')
+    args = parser.parse_args(argv)
+
+    try:
+        client = get_supabase_client()
+        frames = [load_spread_picks(client, args.season, args.weeks), load_totals_picks(client, args.season, args.weeks)]
+        picks = pd.concat([f for f in frames if not f.empty] or [frames[0]], ignore_index=True)
+        if picks.empty:
+            print(f"❌ No picks found for {args.season}")
+            return 1
+
+        kickoffs = to_utc(picks['commence_time'])
+        snapshots = load_snapshots(client, kickoffs.min(), kickoffs.max())
+        results = load_results(client, args.season)
+    except Exception as e:
+        print(f"❌ Error loading data: {e}")
+        return 1
+
+    print(f"\n{'='*80}")
+    print(f"Closing-line value - {args.season} season: {len(picks)} picks, {len(snapshots)} odds snapshots")
+    print(f"{'='*80}")
+
+    graded = analyze(picks, snapshots, results)
+    print_report(graded)
+
+    if args.output:
+        graded.to_csv(args.output, index=False)
+        print(f"\n✅ Wrote {len(graded)} picks to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
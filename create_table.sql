@@ -23,6 +23,10 @@ CREATE TABLE IF NOT EXISTS public.player_stats_2025 (
     last_3_games_rushing_avg DECIMAL(5,2),
     last_3_games_receiving_avg DECIMAL(5,2),
     last_3_games_passing_avg DECIMAL(5,2),
+    target_share DECIMAL(5,4), -- share of team targets
+    carry_share DECIMAL(5,4), -- share of team carries
+    opportunity_share DECIMAL(5,4), -- share of team carries + targets
+    position_rank INTEGER, -- within-position rank on the position's selection metric
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
@@ -31,6 +35,10 @@ CREATE TABLE IF NOT EXISTS public.player_stats_2025 (
 CREATE INDEX IF NOT EXISTS idx_player_stats_2025_player_name ON public.player_stats_2025(player_name);
 CREATE INDEX IF NOT EXISTS idx_player_stats_2025_position ON public.player_stats_2025(position);
 CREATE INDEX IF NOT EXISTS idx_player_stats_2025_team ON public.player_stats_2025(team);
+CREATE INDEX IF NOT EXISTS idx_player_stats_2025_position_rank ON public.player_stats_2025(position, position_rank);
 
-
-
+-- Usage-share columns for tables created before they were added
+ALTER TABLE public.player_stats_2025 ADD COLUMN IF NOT EXISTS target_share DECIMAL(5,4);
+ALTER TABLE public.player_stats_2025 ADD COLUMN IF NOT EXISTS carry_share DECIMAL(5,4);
+ALTER TABLE public.player_stats_2025 ADD COLUMN IF NOT EXISTS opportunity_share DECIMAL(5,4);
+ALTER TABLE public.player_stats_2025 ADD COLUMN IF NOT EXISTS position_rank INTEGER;
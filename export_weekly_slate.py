@@ -0,0 +1,381 @@
+"""
+Export a precomputed weekly slate snapshot for the best-bets API routes.
+
+Runs after ingestion and prediction generation. Reads the stored spread,
+totals and player prop predictions for one week, ranks and formats them the
+same way /api/best-bets, /api/best-totals-bets and /api/best-prop-bets do,
+and writes a single gzip-compressed JSON artifact to weekly_slate_snapshots
+(and optionally to a static .json.gz file).
+
+Usage:
+    python export_weekly_slate.py --week 11 --season 2025
+    python export_weekly_slate.py --week 11 --season 2025 --output public/slates/2025-11.json.gz
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+# Bump when the payload layout changes so readers can ignore stale artifacts
+SLATE_SCHEMA_VERSION = 1
+SNAPSHOT_TABLE = 'weekly_slate_snapshots'
+
+# Route limits: store enough rows to serve the largest allowed ?limit=
+MAX_SPREAD_PICKS = 20
+MAX_TOTALS_PICKS = 20
+MAX_PROP_PICKS = 50
+
+# PostgREST caps responses at 1000 rows; page through larger tables
+PAGE_SIZE = 1000
+
+PROP_MARKET_NAMES = {
+    'player_pass_yds': 'Passing Yards',
+    'player_pass_tds': 'Passing TDs',
+    'player_pass_attempts': 'Pass Attempts',
+    'player_pass_completions': 'Completions',
+    'player_rush_yds': 'Rushing Yards',
+    'player_rush_attempts': 'Rush Attempts',
+    'player_reception_yds': 'Receiving Yards',
+    'player_receptions': 'Receptions',
+    'player_anytime_td': 'Anytime TD',
+}
+
+load_dotenv()
+
+
+def get_supabase_client() -> Client:
+    """Initialize Supabase client"""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise Exception('Missing Supabase credentials in .env file')
+
+    return create_client(url, key)
+
+
+def fetch_all(build_query) -> List[Dict[str, Any]]:
+    """Page through a PostgREST query until it returns a short page."""
+    rows: List[Dict[str, Any]] = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+def to_float(value: Any, default: float = 0.0) -> float:
+    """Convert numeric/None to float (Supabase returns NUMERIC as strings)."""
+    try:
+        return float(value) if value is not None else default
+    except (ValueError, TypeError):
+        return default
+
+
+# ---------------------------------------------------------------------------
+# Team stats (mirrors getTeamStats in src/lib/fetchNFLStats.ts)
+# ---------------------------------------------------------------------------
+
+def map_team_stats(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an auto_nfl_team_stats row to the NFLTeamStats shape used by the UI."""
+    ties = row.get('ties') or 0
+    return {
+        'team_name': row.get('team_name'),
+        'week_number': row.get('week'),
+        'season_year': row.get('season'),
+        'wins': row.get('wins'),
+        'losses': row.get('losses'),
+        'ties': ties,
+        'win_loss_record': f"{row.get('wins')}-{row.get('losses')}-{ties}",
+        'win_percentage': to_float(row.get('win_percentage')),
+        'points_per_game': to_float(row.get('points_per_game')),
+        'points_allowed_per_game': to_float(row.get('points_allowed_per_game')),
+        'point_differential': row.get('point_differential') or 0,
+        'margin_of_victory': to_float(row.get('margin_of_victory')),
+        'strength_of_schedule': to_float(row.get('strength_of_schedule')),
+        'offensive_rating': to_float(row.get('offensive_srs')),
+        'defensive_rating': to_float(row.get('defensive_srs')),
+        'key_injuries': [],
+    }
+
+
+def load_team_stats(client: Client) -> Dict[str, Dict[str, Any]]:
+    """Latest auto_nfl_team_stats row per team, keyed by team name."""
+    rows = fetch_all(lambda: client.table('auto_nfl_team_stats').select('*'))
+    latest: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        name = row.get('team_name')
+        current = latest.get(name)
+        if current is None or (row.get('week') or 0) > (current.get('week') or 0):
+            latest[name] = row
+    return {name: map_team_stats(row) for name, row in latest.items()}
+
+
+# ---------------------------------------------------------------------------
+# Spreads (mirrors src/app/api/best-bets/route.ts)
+# ---------------------------------------------------------------------------
+
+def format_spread_bet(pred: Dict[str, Any], game: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve the display bet, current spread and strength for a spread pick."""
+    bet = pred.get('recommended_bet')
+    confidence = to_float(pred.get('confidence_score'))
+    value = to_float(pred.get('value_score'))
+
+    strength = 'value'
+    if confidence >= 75 and value >= 3.5:
+        strength = 'strong'
+    elif confidence >= 65 and value >= 2.5:
+        strength = 'good'
+
+    home, away = game.get('home_team'), game.get('away_team')
+    if bet == 'home_spread':
+        return {'recommended_bet': f"{home} {game.get('home_spread')}", 'current_spread': game.get('home_spread'), 'bet_strength': strength}
+    if bet == 'away_spread':
+        return {'recommended_bet': f"{away} {game.get('away_spread')}", 'current_spread': game.get('away_spread'), 'bet_strength': strength}
+    if bet == 'home_ml':
+        return {'recommended_bet': f"{home} Moneyline ({game.get('home_price')})", 'current_spread': game.get('home_spread'), 'bet_strength': strength}
+    if bet == 'away_ml':
+        return {'recommended_bet': f"{away} Moneyline ({game.get('away_price')})", 'current_spread': game.get('away_spread'), 'bet_strength': strength}
+
+    # No explicit side: value is on the underdog if the model sees a closer game
+    model_margin = to_float(pred.get('predicted_spread'))
+    vegas_home_spread = to_float(game.get('home_spread'))
+    if abs(model_margin) < abs(vegas_home_spread):
+        if vegas_home_spread > 0:
+            return {'recommended_bet': f"{home} {game.get('home_spread')}", 'current_spread': game.get('home_spread'), 'bet_strength': 'value'}
+        return {'recommended_bet': f"{away} {game.get('away_spread')}", 'current_spread': game.get('away_spread'), 'bet_strength': 'value'}
+    winner = pred.get('predicted_winner')
+    spread = game.get('home_spread') if winner == home else game.get('away_spread')
+    return {'recommended_bet': f"{winner} {spread}", 'current_spread': spread, 'bet_strength': 'value'}
+
+
+def build_spread_picks(client: Client, week: int, season: int, team_stats: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rank and format spread picks exactly as /api/best-bets does."""
+    rows = fetch_all(lambda: client.table('spread_predictions')
+        .select('*, odds_bets:game_id (home_team, away_team, home_spread, away_spread, home_price, away_price, commence_time)')
+        .gte('value_score', 1.3)
+        .neq('recommended_bet', 'none')
+        .eq('week_number', week)
+        .eq('season', season))
+
+    def sort_score(p: Dict[str, Any]) -> float:
+        confidence = to_float(p.get('confidence_score'))
+        return confidence + 10 if to_float(p.get('value_score')) >= 4.0 else confidence
+
+    ranked = sorted(rows, key=sort_score, reverse=True)[:MAX_SPREAD_PICKS]
+
+    picks = []
+    for pred in ranked:
+        game = pred.get('odds_bets') or {}
+        confidence = to_float(pred.get('confidence_score'))
+        value = to_float(pred.get('value_score'))
+        picks.append({
+            'game_id': pred.get('game_id'),
+            'home_team': game.get('home_team'),
+            'away_team': game.get('away_team'),
+            'commence_time': game.get('commence_time'),
+            'predicted_winner': pred.get('predicted_winner'),
+            'confidence_score': pred.get('confidence_score'),
+            'predicted_margin': pred.get('predicted_spread'),
+            'home_team_strength': pred.get('home_team_strength'),
+            'away_team_strength': pred.get('away_team_strength'),
+            'home_moneyline': game.get('home_price'),
+            'away_moneyline': game.get('away_price'),
+            'value_score': pred.get('value_score'),
+            'bet_type': pred.get('recommended_bet'),
+            'reasoning': pred.get('reasoning'),
+            'week_number': pred.get('week_number'),
+            'season': pred.get('season'),
+            'created_at': pred.get('created_at'),
+            'quality_score': confidence * min(value, 7.5),
+            'home_stats': team_stats.get(game.get('home_team')),
+            'away_stats': team_stats.get(game.get('away_team')),
+            **format_spread_bet(pred, game),
+        })
+    return picks
+
+
+# ---------------------------------------------------------------------------
+# Totals (mirrors getBestTotalsBets in src/lib/predictTotals.ts)
+# ---------------------------------------------------------------------------
+
+def build_totals_picks(client: Client, week: int, season: int) -> List[Dict[str, Any]]:
+    """Top totals predictions with a recommendation, ordered by edge."""
+    return client.table('totals_predictions')\
+        .select('*')\
+        .not_.is_('recommended_bet', 'null')\
+        .eq('week_number', week)\
+        .eq('season', season)\
+        .order('value_score', desc=True)\
+        .limit(MAX_TOTALS_PICKS)\
+        .execute().data or []
+
+
+# ---------------------------------------------------------------------------
+# Player props (mirrors src/app/api/best-prop-bets/route.ts)
+# ---------------------------------------------------------------------------
+
+def get_prop_bet_strength(confidence: float, value: float) -> str:
+    """Determine bet strength tier"""
+    if confidence >= 75 and value >= 5:
+        return 'elite'
+    if confidence >= 70 and value >= 4:
+        return 'strong'
+    if confidence >= 65 and value >= 3:
+        return 'good'
+    return 'value'
+
+
+def build_prop_picks(client: Client, week: int, season: int) -> List[Dict[str, Any]]:
+    """Rank props by quality score and keep the best prop per player."""
+    rows = fetch_all(lambda: client.table('player_prop_predictions')
+        .select('*')
+        .not_.is_('recommended_bet', 'null')
+        .gte('confidence_score', 60)
+        .eq('week_number', week)
+        .eq('season', season)
+        .order('confidence_score', desc=True))
+
+    for p in rows:
+        p['quality_score'] = to_float(p.get('confidence_score')) * min(abs(to_float(p.get('value_score'))), 10)
+    rows.sort(key=lambda p: p['quality_score'], reverse=True)
+
+    picks = []
+    seen_players = set()
+    for pred in rows:
+        if pred.get('player_name') in seen_players:
+            continue
+        seen_players.add(pred.get('player_name'))
+
+        confidence = to_float(pred.get('confidence_score'))
+        value = to_float(pred.get('value_score'))
+        picks.append({
+            'prop_id': pred.get('prop_id'),
+            'player_name': pred.get('player_name'),
+            'team': pred.get('team'),
+            'opponent': pred.get('opponent'),
+            'position': pred.get('position'),
+            'prop_market': PROP_MARKET_NAMES.get(pred.get('prop_market'), pred.get('prop_market')),
+            'prop_line': pred.get('prop_line'),
+            'predicted_value': pred.get('predicted_value'),
+            'recommended_bet': pred.get('recommended_bet'),
+            'confidence_score': pred.get('confidence_score'),
+            'value_score': pred.get('value_score'),
+            'odds': pred.get('odds'),
+            'reasoning': pred.get('reasoning'),
+            'breakdown': pred.get('breakdown'),
+            'week_number': pred.get('week_number'),
+            'season': pred.get('season'),
+            'quality_score': pred['quality_score'],
+            'display_line': f"{pred.get('recommended_bet')} {pred.get('prop_line')}",
+            'display_edge': f"{'+' if value >= 0 else ''}{value:.1f}",
+            'bet_strength': get_prop_bet_strength(confidence, abs(value)),
+        })
+        if len(picks) >= MAX_PROP_PICKS:
+            break
+    return picks
+
+
+# ---------------------------------------------------------------------------
+# Artifact
+# ---------------------------------------------------------------------------
+
+def build_slate(client: Client, week: int, season: int) -> Dict[str, Any]:
+    """Assemble the full slate payload for one week."""
+    team_stats = load_team_stats(client)
+    return {
+        'schema_version': SLATE_SCHEMA_VERSION,
+        'week': week,
+        'season': season,
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'spreads': build_spread_picks(client, week, season, team_stats),
+        'totals': build_totals_picks(client, week, season),
+        'props': build_prop_picks(client, week, season),
+    }
+
+
+def encode_slate(slate: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialize to compact JSON, gzip it and return base64 payload plus hash."""
+    raw = json.dumps(slate, separators=(',', ':'), default=str).encode('utf-8')
+    compressed = gzip.compress(raw, compresslevel=9)
+    return {
+        'payload': base64.b64encode(compressed).decode('ascii'),
+        'content_hash': hashlib.sha256(raw).hexdigest(),
+        'compressed': compressed,
+    }
+
+
+def save_snapshot(client: Client, slate: Dict[str, Any], encoded: Dict[str, Any]) -> None:
+    """Upsert the snapshot row for the slate's week/season."""
+    client.table(SNAPSHOT_TABLE).upsert({
+        'week': slate['week'],
+        'season': slate['season'],
+        'schema_version': slate['schema_version'],
+        'content_hash': encoded['content_hash'],
+        'payload': encoded['payload'],
+        'spread_count': len(slate['spreads']),
+        'totals_count': len(slate['totals']),
+        'props_count': len(slate['props']),
+        'generated_at': slate['generated_at'],
+    }, on_conflict='week,season').execute()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Export a precomputed weekly slate snapshot')
+    parser.add_argument('--week', type=int, required=True)
+    parser.add_argument('--season', type=int, default=datetime.now().year)
+    parser.add_argument('--output', help='Also write the gzip JSON artifact to this path')
+    parser.add_argument('--no-upload', action='store_true', help='Skip writing to Supabase')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    print(f"\n{'='*80}")
+    print(f"Exporting slate snapshot - Week {args.week}, {args.season} Season")
+    print(f"{'='*80}\n")
+
+    try:
+        client = get_supabase_client()
+        slate = build_slate(client, args.week, args.season)
+    except Exception as e:
+        print(f"❌ Error building slate: {e}")
+        return 1
+
+    encoded = encode_slate(slate)
+    print(f"  Spreads: {len(slate['spreads'])}")
+    print(f"  Totals:  {len(slate['totals'])}")
+    print(f"  Props:   {len(slate['props'])}")
+    print(f"  Size:    {len(encoded['compressed'])} bytes compressed ({encoded['content_hash'][:12]})\n")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'wb') as f:
+            f.write(encoded['compressed'])
+        print(f"  ✅ Wrote {args.output}")
+
+    if not args.no_upload:
+        try:
+            save_snapshot(client, slate, encoded)
+            print(f"  ✅ Saved to {SNAPSHOT_TABLE}")
+        except Exception as e:
+            print(f"  ❌ Upload failed: {e}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
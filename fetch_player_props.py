@@ -0,0 +1,349 @@
+"""
+Async per-event player prop ingestion from The Odds API.
+
+Replaces the one-off scripts/fetch-*-props.ts scripts with one reusable
+engine for a whole slate:
+
+  - every upcoming event for the week is fetched concurrently, bounded by
+    MAX_CONCURRENT_REQUESTS
+  - each request only asks for markets that are due for a refresh (a market is
+    re-pulled more often the closer its game is to kickoff), which is what
+    The Odds API bills for
+  - x-requests-remaining / x-requests-used headers are tracked and no new
+    requests are started once remaining credits drop to QUOTA_RESERVE
+  - markets whose outcomes did not change since the last pull are not
+    rewritten; changed markets are replaced in player_props atomically per
+    event (replace_player_props RPC)
+
+Only the refresh schedule saves credits: the Odds API has no free way to ask
+whether an event's props moved, so an unchanged market is detected (by
+content hash) after its paid pull and merely skips the database write.
+
+Sync state (last pull and content hash per event/market) lives in
+player_props_sync_state. Set ODDS_API_BASE_URL to point at a local mock server.
+
+Usage:
+    python fetch_player_props.py --week 11
+    python fetch_player_props.py --week 11 --force
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+load_dotenv()
+
+ODDS_API_KEY = os.getenv('ODDS_API_KEY', '')
+ODDS_API_BASE_URL = os.getenv('ODDS_API_BASE_URL', 'https://api.the-odds-api.com')
+SPORT_KEY = 'americanfootball_nfl'
+BOOKMAKERS = os.getenv('PROPS_BOOKMAKERS', 'draftkings')
+
+PROP_MARKETS = [
+    'player_pass_yds', 'player_pass_tds', 'player_pass_completions', 'player_pass_attempts',
+    'player_rush_yds', 'player_rush_attempts',
+    'player_receptions', 'player_reception_yds',
+    'player_anytime_td',
+]
+
+PROPS_TABLE = 'player_props'
+STATE_TABLE = 'player_props_sync_state'
+REPLACE_PROPS_RPC = 'replace_player_props'
+
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Stop starting new requests once the remaining quota drops to this many credits
+QUOTA_RESERVE = int(os.getenv('ODDS_API_QUOTA_RESERVE', '50'))
+
+# How stale a market may get before it is re-pulled, by hours until kickoff
+REFRESH_INTERVALS = [
+    (timedelta(hours=3), timedelta(minutes=15)),
+    (timedelta(hours=24), timedelta(hours=1)),
+    (timedelta(days=3), timedelta(hours=6)),
+]
+DEFAULT_REFRESH_INTERVAL = timedelta(hours=12)
+
+
+def get_supabase_client() -> Client:
+    """Initialize Supabase client"""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise Exception('Missing Supabase credentials in .env file')
+
+    return create_client(url, key)
+
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def refresh_interval(commence_time: datetime, now: datetime) -> timedelta:
+    """Allowed staleness for a market given time until kickoff."""
+    until_kickoff = commence_time - now
+    for horizon, interval in REFRESH_INTERVALS:
+        if until_kickoff <= horizon:
+            return interval
+    return DEFAULT_REFRESH_INTERVAL
+
+
+class QuotaTracker:
+    """Tracks Odds API credit headers across concurrent requests."""
+
+    def __init__(self, reserve: int) -> None:
+        self.reserve = reserve
+        self.remaining: Optional[int] = None
+        self.used: Optional[int] = None
+        self.spent = 0
+
+    def update(self, headers: Dict[str, str]) -> None:
+        if 'x-requests-remaining' in headers:
+            remaining = int(float(headers['x-requests-remaining']))
+            # Responses can arrive out of order; the lowest value is the latest
+            self.remaining = remaining if self.remaining is None else min(self.remaining, remaining)
+        if 'x-requests-used' in headers:
+            used = int(float(headers['x-requests-used']))
+            self.used = used if self.used is None else max(self.used, used)
+        self.spent += int(float(headers.get('x-requests-last', 0) or 0))
+
+    def can_spend(self, cost: int) -> bool:
+        return self.remaining is None or self.remaining - cost >= self.reserve
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+def load_events(client: Client, week: int, now: datetime) -> List[Dict[str, Any]]:
+    """Upcoming games for the week from odds_bets."""
+    rows = client.table('odds_bets')\
+        .select('api_id, home_team, away_team, commence_time')\
+        .eq('week', week)\
+        .gte('commence_time', now.isoformat())\
+        .order('commence_time')\
+        .execute().data or []
+    return rows
+
+
+def load_sync_state(client: Client, event_ids: List[str]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    if not event_ids:
+        return {}
+    rows = client.table(STATE_TABLE)\
+        .select('event_id, prop_market, last_pulled_at, content_hash')\
+        .in_('event_id', event_ids)\
+        .execute().data or []
+    return {(r['event_id'], r['prop_market']): r for r in rows}
+
+
+def plan_requests(events: List[Dict[str, Any]], state: Dict[Tuple[str, str], Dict[str, Any]],
+                  now: datetime, force: bool = False) -> List[Tuple[Dict[str, Any], List[str]]]:
+    """(event, due_markets) pairs, most overdue first.
+
+    Events with nothing due are skipped entirely. Ordering by how far past its
+    refresh interval an event is (never-pulled first, then earliest kickoff)
+    means the stalest lines are still fetched when the quota reserve cuts a
+    run short.
+    """
+    plan = []
+    for event in events:
+        commence = parse_time(event['commence_time'])
+        interval = refresh_interval(commence, now)
+        due = []
+        overdue = 0.0
+        for market in PROP_MARKETS:
+            last = parse_time((state.get((event['api_id'], market)) or {}).get('last_pulled_at'))
+            if last is None:
+                due.append(market)
+                overdue = float('inf')
+            elif force or now - last >= interval:
+                due.append(market)
+                overdue = max(overdue, (now - last) / interval)
+        if due:
+            plan.append((overdue, commence, event, due))
+    plan.sort(key=lambda p: (-p[0], p[1]))
+    return [(event, due) for _, _, event, due in plan]
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+def request_event_odds(event_id: str, markets: List[str]) -> requests.Response:
+    url = f"{ODDS_API_BASE_URL}/v4/sports/{SPORT_KEY}/events/{event_id}/odds"
+    return requests.get(url, params={
+        'apiKey': ODDS_API_KEY,
+        'bookmakers': BOOKMAKERS,
+        'markets': ','.join(markets),
+        'oddsFormat': 'american',
+    }, timeout=REQUEST_TIMEOUT_SECONDS)
+
+
+async def fetch_event(event: Dict[str, Any], markets: List[str], semaphore: asyncio.Semaphore,
+                      quota: QuotaTracker) -> Optional[Dict[str, Any]]:
+    """Fetch one event's due markets, respecting concurrency and quota."""
+    async with semaphore:
+        # Each market costs one credit per bookmaker region
+        if not quota.can_spend(len(markets)):
+            print(f"   ⏭️  {event['away_team']} @ {event['home_team']}: quota reserve reached, skipping")
+            return None
+        try:
+            response = await asyncio.to_thread(request_event_odds, event['api_id'], markets)
+        except requests.RequestException as e:
+            print(f"   ❌ {event['away_team']} @ {event['home_team']}: {e}")
+            return None
+        # Record credits before releasing the slot so the next request sees them
+        quota.update({k.lower(): v for k, v in response.headers.items()})
+
+    if not response.ok:
+        print(f"   ⚠️  {event['away_team']} @ {event['home_team']}: API error {response.status_code}")
+        return None
+    return response.json()
+
+
+def parse_event_props(data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """player_props rows grouped by market."""
+    by_market: Dict[str, List[Dict[str, Any]]] = {}
+    for bookmaker in data.get('bookmakers') or []:
+        for market in bookmaker.get('markets') or []:
+            rows = by_market.setdefault(market['key'], [])
+            for outcome in market.get('outcomes') or []:
+                rows.append({
+                    'event_id': data['id'],
+                    'sport_key': data.get('sport_key'),
+                    'sport_title': data.get('sport_title'),
+                    'commence_time': data.get('commence_time'),
+                    'home_team': data.get('home_team'),
+                    'away_team': data.get('away_team'),
+                    'player_name': outcome.get('description') or outcome.get('name'),
+                    'prop_market': market['key'],
+                    'bookmaker_key': bookmaker.get('key'),
+                    'bookmaker_title': bookmaker.get('title'),
+                    'bet_type': outcome.get('name'),
+                    'line': outcome.get('point'),
+                    'odds': outcome.get('price'),
+                    'last_update': market.get('last_update'),
+                })
+    return by_market
+
+
+def market_hash(rows: List[Dict[str, Any]]) -> str:
+    """Hash of a market's prices/lines, ignoring timestamps."""
+    key = sorted((r['bookmaker_key'], r['player_name'], r['bet_type'], r['line'], r['odds']) for r in rows)
+    return hashlib.sha256(json.dumps(key, default=str).encode('utf-8')).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+def write_changes(client: Client, changed: Dict[str, Dict[str, List[Dict[str, Any]]]],
+                  state_rows: List[Dict[str, Any]]) -> int:
+    """Replace changed markets in player_props and record sync state.
+
+    Each event's markets are deleted and re-inserted inside one
+    replace_player_props call, so a failed write never leaves a market empty.
+    Sync state is only recorded after every write succeeded.
+    """
+    written = 0
+    for event_id, markets in changed.items():
+        rows = [row for market_rows in markets.values() for row in market_rows]
+        client.rpc(REPLACE_PROPS_RPC, {
+            'p_event_id': event_id,
+            'p_markets': list(markets.keys()),
+            'p_rows': rows,
+        }).execute()
+        written += len(rows)
+
+    if state_rows:
+        client.table(STATE_TABLE).upsert(state_rows, on_conflict='event_id,prop_market').execute()
+    return written
+
+
+async def ingest(client: Client, week: int, force: bool = False) -> Dict[str, int]:
+    """Fetch, diff and store props for every upcoming event in the week."""
+    now = datetime.now(timezone.utc)
+    events = load_events(client, week, now)
+    state = load_sync_state(client, [e['api_id'] for e in events])
+    plan = plan_requests(events, state, now, force)
+
+    stats = {'events': len(events), 'requested': len(plan), 'changed_markets': 0,
+             'unchanged_markets': 0, 'rows': 0, 'credits': 0}
+    print(f"📅 {len(events)} upcoming events, {len(plan)} with markets due "
+          f"({sum(len(m) for _, m in plan)} markets)\n")
+    if not plan:
+        return stats
+
+    quota = QuotaTracker(QUOTA_RESERVE)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    results = await asyncio.gather(*(fetch_event(e, m, semaphore, quota) for e, m in plan))
+
+    changed: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    state_rows: List[Dict[str, Any]] = []
+    pulled_at = datetime.now(timezone.utc).isoformat()
+    for (event, markets), data in zip(plan, results):
+        if data is None:
+            continue
+        by_market = parse_event_props(data)
+        for market in markets:
+            rows = by_market.get(market, [])
+            digest = market_hash(rows)
+            previous = (state.get((event['api_id'], market)) or {}).get('content_hash')
+            if digest == previous:
+                stats['unchanged_markets'] += 1
+            else:
+                changed.setdefault(event['api_id'], {})[market] = rows
+                stats['changed_markets'] += 1
+            state_rows.append({'event_id': event['api_id'], 'prop_market': market,
+                               'last_pulled_at': pulled_at, 'content_hash': digest})
+
+    stats['rows'] = write_changes(client, changed, state_rows)
+    stats['credits'] = quota.spent
+    if quota.remaining is not None:
+        print(f"💳 Credits spent: {quota.spent}, remaining: {quota.remaining}")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Fetch player props for a whole slate')
+    parser.add_argument('--week', type=int, required=True)
+    parser.add_argument('--force', action='store_true', help='Re-pull every market regardless of age')
+    args = parser.parse_args(argv)
+
+    print(f"\n{'='*80}")
+    print(f"🏈 PLAYER PROPS INGESTION - Week {args.week}")
+    print(f"{'='*80}\n")
+
+    if not ODDS_API_KEY:
+        print("❌ Missing ODDS_API_KEY in environment")
+        return 1
+
+    try:
+        client = get_supabase_client()
+        stats = asyncio.run(ingest(client, args.week, args.force))
+    except Exception as e:
+        print(f"❌ Ingestion failed: {e}")
+        return 1
+
+    print(f"\n{'='*80}")
+    print(f"  Events requested:  {stats['requested']}/{stats['events']}")
+    print(f"  Markets changed:   {stats['changed_markets']}")
+    print(f"  Markets unchanged: {stats['unchanged_markets']}")
+    print(f"  Rows written:      {stats['rows']}")
+    print(f"{'='*80}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
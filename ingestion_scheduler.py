@@ -0,0 +1,301 @@
+"""
+Game-window-aware refresh scheduler for the ingestion jobs.
+
+Replaces the fixed-cadence n8n cron with a small daemon that reads the NFL
+schedule from nfl_data_py and only runs a job when its source could have
+changed:
+
+  standings     - shortly after each kickoff window's games finish
+  player_stats  - once per game day, after nfl_data_py has republished weekly data
+  injuries      - Wed-Sat practice report drops, plus before each window for inactives
+  odds          - spreads/moneylines and totals: a daily morning pull, plus a few hours
+                  and minutes before each window
+
+Triggers for the same job that land close together are collapsed into one run,
+a job that is triggered while still running is rerun once afterwards instead of
+stacking, and at most MAX_CONCURRENCY jobs run at the same time.
+
+Usage:
+    python ingestion_scheduler.py               # run as a daemon
+    python ingestion_scheduler.py --dry-run     # print the next week's plan and exit
+"""
+
+import argparse
+import heapq
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import requests
+from dotenv import load_dotenv
+
+from table_cache_service import invalidate_cache
+
+load_dotenv()
+
+EASTERN = ZoneInfo('America/New_York')
+
+# Typical NFL game length from kickoff to final whistle
+GAME_DURATION = timedelta(hours=3, minutes=30)
+
+# Triggers for the same job within this span collapse into the latest one
+DEDUPE_WINDOW = timedelta(minutes=45)
+
+# Horizon planned at once; the plan is rebuilt every REPLAN_INTERVAL
+PLAN_HORIZON = timedelta(days=7)
+REPLAN_INTERVAL = timedelta(hours=12)
+
+MAX_CONCURRENCY = int(os.getenv('SCHEDULER_MAX_CONCURRENCY', '2'))
+JOB_TIMEOUT_SECONDS = 30 * 60
+
+APP_URL = os.getenv('APP_URL', 'http://localhost:3000')
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+Window = Tuple[datetime, datetime]  # (first kickoff, expected final whistle), UTC
+
+
+def load_game_windows(season: int) -> List[Window]:
+    """Group the season's games by kickoff time into (start, end) windows."""
+    from nfl_data_py import import_schedules
+
+    schedule = import_schedules([season])
+    kickoffs = set()
+    for row in schedule.itertuples(index=False):
+        if not isinstance(row.gameday, str) or not isinstance(row.gametime, str):
+            continue
+        local = datetime.strptime(f"{row.gameday} {row.gametime}", '%Y-%m-%d %H:%M')
+        kickoffs.add(local.replace(tzinfo=EASTERN).astimezone(timezone.utc))
+
+    return [(kickoff, kickoff + GAME_DURATION) for kickoff in sorted(kickoffs)]
+
+
+def at_eastern(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=EASTERN).astimezone(timezone.utc)
+
+
+def days_between(start: datetime, end: datetime) -> List[date]:
+    first = start.astimezone(EASTERN).date()
+    return [first + timedelta(days=i) for i in range((end - start).days + 2)]
+
+
+# ---------------------------------------------------------------------------
+# Trigger rules: each returns candidate run times for [start, end)
+# ---------------------------------------------------------------------------
+
+def standings_triggers(windows: List[Window], start: datetime, end: datetime) -> List[datetime]:
+    # PFR standings update within minutes of a final
+    return [final + timedelta(minutes=30) for _, final in windows]
+
+
+def player_stats_triggers(windows: List[Window], start: datetime, end: datetime) -> List[datetime]:
+    # nfl_data_py weekly data is republished overnight, so one run per game day
+    # after that day's last final covers every window
+    last_final: Dict[date, datetime] = {}
+    for kickoff, final in windows:
+        day = kickoff.astimezone(EASTERN).date()
+        last_final[day] = max(final, last_final.get(day, final))
+    return [final + timedelta(hours=8) for final in last_final.values()]
+
+
+def injuries_triggers(windows: List[Window], start: datetime, end: datetime) -> List[datetime]:
+    # Practice reports post late afternoon Wed-Fri (Sat for weekend games);
+    # inactives are announced 90 minutes before kickoff
+    reports = [at_eastern(d, 16, 30) for d in days_between(start, end) if d.weekday() in (2, 3, 4, 5)]
+    inactives = [kickoff - timedelta(minutes=85) for kickoff, _ in windows]
+    return reports + inactives
+
+
+def odds_triggers(windows: List[Window], start: datetime, end: datetime) -> List[datetime]:
+    daily = [at_eastern(d, 10) for d in days_between(start, end)]
+    pregame = []
+    for kickoff, _ in windows:
+        pregame += [kickoff - timedelta(hours=3), kickoff - timedelta(minutes=45)]
+    return daily + pregame
+
+
+def run_command(command: List[str]) -> bool:
+    result = subprocess.run(command, cwd=PROJECT_DIR, timeout=JOB_TIMEOUT_SECONDS)
+    return result.returncode == 0
+
+
+def call_api(path: str) -> bool:
+    response = requests.get(f"{APP_URL}{path}", timeout=JOB_TIMEOUT_SECONDS)
+    return response.ok
+
+
+def call_apis(*paths: str) -> bool:
+    """Call every route even if an earlier one fails or raises; True only if all succeed."""
+    results = []
+    for path in paths:
+        try:
+            results.append(call_api(path))
+        except requests.RequestException as e:
+            print(f"  ❌ {path} failed: {e}")
+            results.append(False)
+    return all(results)
+
+
+JOBS: Dict[str, Dict[str, Callable]] = {
+    'standings': {
+        'triggers': standings_triggers,
+        'run': lambda: run_command([sys.executable, 'save_nfl_stats_to_db.py']),
+    },
+    'player_stats': {
+        'triggers': player_stats_triggers,
+        'run': lambda: run_command([sys.executable, 'player_stats_loader.py']),
+    },
+    'injuries': {
+        'triggers': injuries_triggers,
+        'run': lambda: run_command(['npx', 'tsx', 'scripts/scrape-pfr-injuries-current.ts']),
+    },
+    'odds': {
+        'triggers': odds_triggers,
+        # Spreads/moneylines (odds_bets) and totals (totals_odds) sync separately;
+        # both always run, and the job fails if either does
+        'run': lambda: call_apis('/api/sync-odds', '/api/sync-totals-odds'),
+    },
+}
+
+
+# Tables held by table_cache_service.py that each job rewrites. Jobs whose tables
+# are not cached are left out: 'odds' rewrites odds_bets and totals_odds, and
+# 'player_stats' rewrites the player stats tables, so add them here if any of
+# those tables joins CACHED_TABLES.
+JOB_CACHED_TABLES: Dict[str, List[str]] = {
+    'standings': ['auto_nfl_team_stats'],
+    'injuries': ['injuries'],
+}
+
+
+def dedupe_times(times: List[datetime]) -> List[datetime]:
+    """Collapse clusters of triggers within DEDUPE_WINDOW to the latest one."""
+    kept: List[datetime] = []
+    cluster_start: Optional[datetime] = None
+    for t in sorted(times):
+        if cluster_start is not None and t - cluster_start <= DEDUPE_WINDOW:
+            kept[-1] = t
+        else:
+            kept.append(t)
+            cluster_start = t
+    return kept
+
+
+def build_plan(windows: List[Window], start: datetime, end: datetime) -> List[Tuple[datetime, str]]:
+    """All (run_at, job_name) pairs in [start, end), deduplicated per job."""
+    relevant = [w for w in windows if w[1] >= start - timedelta(days=1) and w[0] <= end]
+    plan = []
+    for name, job in JOBS.items():
+        times = [t for t in job['triggers'](relevant, start, end) if start <= t < end]
+        plan += [(t, name) for t in dedupe_times(times)]
+    return sorted(plan)
+
+
+class Runner:
+    """Runs jobs on a bounded pool; coalesces triggers that arrive mid-run."""
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.pool = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.lock = threading.Lock()
+        self.running: set = set()
+        self.rerun: set = set()
+
+    def submit(self, name: str) -> None:
+        with self.lock:
+            if name in self.running:
+                # Already in flight: run once more afterwards, however many triggers arrive
+                self.rerun.add(name)
+                return
+            self.running.add(name)
+        self.pool.submit(self._run, name)
+
+    def _run(self, name: str) -> None:
+        started = time.monotonic()
+        print(f"  ▶️  {name} started")
+        try:
+            ok = JOBS[name]['run']()
+        except Exception as e:
+            print(f"  ❌ {name} failed: {e}")
+            ok = False
+        print(f"  {'✅' if ok else '❌'} {name} finished in {time.monotonic() - started:.0f}s")
+        if ok and name in JOB_CACHED_TABLES:
+            invalidate_cache(JOB_CACHED_TABLES[name])
+
+        with self.lock:
+            again = name in self.rerun
+            self.rerun.discard(name)
+            if not again:
+                self.running.discard(name)
+        if again:
+            self._run(name)
+
+
+def print_plan(plan: List[Tuple[datetime, str]]) -> None:
+    for run_at, name in plan:
+        print(f"  {run_at.astimezone(EASTERN):%a %b %d %I:%M %p} ET  {name}")
+
+
+def replan(queue: List[Tuple[datetime, str]], windows: List[Window], season: int,
+           now: datetime) -> List[Tuple[datetime, str]]:
+    """Rebuild the queue from a fresh schedule so flexed or moved kickoffs are picked up.
+
+    Runs already due are kept; everything later is replanned. The windows
+    list is updated in place, and left as is if the schedule cannot be loaded.
+    """
+    try:
+        windows[:] = load_game_windows(season)
+    except Exception as e:
+        print(f"⚠️  Could not reload {season} schedule, keeping the previous one: {e}")
+    overdue = [item for item in queue if item[0] < now]
+    queue = overdue + build_plan(windows, now, now + PLAN_HORIZON)
+    heapq.heapify(queue)
+    return queue
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Game-window-aware ingestion scheduler')
+    parser.add_argument('--season', type=int, default=datetime.now().year)
+    parser.add_argument('--dry-run', action='store_true', help='Print the upcoming plan and exit')
+    args = parser.parse_args(argv)
+
+    try:
+        windows = load_game_windows(args.season)
+    except Exception as e:
+        print(f"❌ Could not load {args.season} schedule: {e}")
+        return 1
+
+    now = datetime.now(timezone.utc)
+    print(f"\n{'='*80}")
+    print(f"Ingestion scheduler - {len(windows)} kickoff windows in {args.season}")
+    print(f"{'='*80}\n")
+
+    if args.dry_run:
+        print_plan(build_plan(windows, now, now + PLAN_HORIZON))
+        return 0
+
+    runner = Runner(MAX_CONCURRENCY)
+    queue: List[Tuple[datetime, str]] = []
+    planned_until = now
+
+    while True:
+        now = datetime.now(timezone.utc)
+        if now >= planned_until - PLAN_HORIZON + REPLAN_INTERVAL:
+            queue = replan(queue, windows, args.season, now)
+            planned_until = now + PLAN_HORIZON
+
+        if queue and queue[0][0] <= now:
+            _, name = heapq.heappop(queue)
+            runner.submit(name)
+            continue
+
+        next_run = queue[0][0] if queue else now + REPLAN_INTERVAL
+        time.sleep(max(1.0, min((next_run - now).total_seconds(), 300)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
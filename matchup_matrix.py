@@ -0,0 +1,233 @@
+"""
+Precompute the 32x32 home/away matchup matrix for spread and totals baselines.
+
+predictTotal and predictGame fetch both teams' auto_nfl_team_stats rows for
+every game and rebuild the same pairwise terms (calculateBaseTotalScore, the
+offensive/defensive matchup adjustments, pace, competitiveness, SRS margin).
+This stage loads every team's stats once into arrays indexed by team and
+computes all home/away pairings with numpy broadcasting, mirroring the
+formulas in src/lib/predictTotals.ts and src/lib/predictGames.ts. The result
+is stored per season/week in matchup_matrix so any matchup - including a
+neutral-site what-if - is a single-row lookup.
+
+Usage:
+    python matchup_matrix.py --season 2025
+    python matchup_matrix.py --season 2025 --week 11
+    python matchup_matrix.py --season 2025 --show "Kansas City Chiefs" "Buffalo Bills"
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+load_dotenv()
+
+MATRIX_TABLE = 'matchup_matrix'
+
+# Mirrors TOTALS_WEIGHTS in src/lib/predictTotals.ts
+TOTALS_WEIGHTS = {
+    'base_scoring': 0.30,
+    'offensive_matchup': 0.20,
+    'defensive_matchup': 0.20,
+    'pace_differential': 0.15,
+    'competitiveness': 0.10,
+    'srs_adjustment': 0.05,
+}
+
+# Mirrors predictGame in src/lib/predictGames.ts
+HOME_FIELD_ADVANTAGE = 1.5
+SRS_DAMPENING = 0.70
+DIVISION_GAME_DAMPENING = 0.90
+
+STAT_COLUMNS = [
+    'points_per_game', 'points_allowed_per_game', 'point_differential', 'win_percentage',
+    'srs', 'offensive_srs', 'defensive_srs', 'wins', 'losses', 'ties',
+]
+
+
+def get_supabase_client() -> Client:
+    """Initialize Supabase client"""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise Exception('Missing Supabase credentials in .env file')
+
+    return create_client(url, key)
+
+
+def load_team_stats(client: Client, season: int, week: Optional[int] = None) -> pd.DataFrame:
+    """Latest auto_nfl_team_stats row per team (as of week, if given), sorted by team."""
+    query = client.table('auto_nfl_team_stats')\
+        .select('team_name, division, week, ' + ', '.join(STAT_COLUMNS))\
+        .eq('season', season)
+    if week:
+        query = query.lte('week', week)
+    rows = query.execute().data or []
+
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    df['week'] = pd.to_numeric(df['week'], errors='coerce').fillna(0)
+    df = df.sort_values('week').drop_duplicates('team_name', keep='last')
+    for col in STAT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)
+    return df.sort_values('team_name').reset_index(drop=True)
+
+
+def compute_matrix(stats: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """All home (rows) x away (columns) baseline terms in one broadcasted pass."""
+    def col(name: str):
+        values = stats[name].to_numpy(float)
+        return values[:, None], values[None, :]  # (home, away) views
+
+    ppg_h, ppg_a = col('points_per_game')
+    papg_h, papg_a = col('points_allowed_per_game')
+    osrs_h, osrs_a = col('offensive_srs')
+    dsrs_h, dsrs_a = col('defensive_srs')
+    srs_h, srs_a = col('srs')
+    wp_h, wp_a = col('win_percentage')
+
+    games = (stats['wins'] + stats['losses'] + stats['ties']).to_numpy(float)
+    margin = np.divide(stats['point_differential'].to_numpy(float), games,
+                       out=np.zeros(len(stats)), where=games > 0)
+    margin_h, margin_a = margin[:, None], margin[None, :]
+
+    # calculateBaseTotalScore
+    base_total = (ppg_h + papg_a) / 2 + (ppg_a + papg_h) / 2
+    # calculateOffensiveMatchupAdjustment
+    offensive = ((osrs_h - dsrs_a) + (osrs_a - dsrs_h)) / 4
+    # calculateDefensiveMatchupAdjustment
+    defensive = -((dsrs_h + dsrs_a) / 2) * 0.5
+    # calculatePaceAdjustment
+    pace = ((np.abs(margin_h) + np.abs(margin_a)) / 2) / 5
+    # calculateCompetitivenessAdjustment
+    win_gap = np.abs(wp_h - wp_a)
+    competitiveness = np.select([win_gap < 0.200, win_gap < 0.400], [-2.5, -1.0], (win_gap - 0.400) * 10)
+    # calculateSRSAdjustment
+    srs_adjustment = (srs_h + srs_a) / 5
+
+    w = TOTALS_WEIGHTS
+    predicted_total = (
+        base_total * w['base_scoring']
+        + (base_total + offensive) * w['offensive_matchup']
+        + (base_total + defensive) * w['defensive_matchup']
+        + (base_total + pace) * w['pace_differential']
+        + (base_total + competitiveness) * w['competitiveness']
+        + (base_total + srs_adjustment) * w['srs_adjustment']
+    )
+
+    # predictGame: SRS differential (offensive + defensive) with dampening
+    team_srs = (osrs_h + dsrs_h).ravel()
+    srs_diff = (team_srs[:, None] - team_srs[None, :]) * SRS_DAMPENING
+    division = stats['division'].fillna('').to_numpy()
+    is_division = (division[:, None] == division[None, :]) & (division[:, None] != '')
+    dampening = np.where(is_division, DIVISION_GAME_DAMPENING, 1.0)
+
+    return {
+        'base_total': base_total,
+        'offensive_matchup_adjustment': offensive,
+        'defensive_matchup_adjustment': defensive,
+        'pace_adjustment': pace,
+        'competitiveness_adjustment': competitiveness,
+        'srs_adjustment': srs_adjustment,
+        'predicted_total': predicted_total,
+        'expected_margin': (srs_diff + HOME_FIELD_ADVANTAGE) * dampening,
+        'expected_margin_neutral': srs_diff * dampening,
+        'is_division_game': is_division,
+    }
+
+
+class MatchupMatrix:
+    """Team-indexed matrix with O(1) home/away lookups."""
+
+    def __init__(self, teams: List[str], terms: Dict[str, np.ndarray]) -> None:
+        self.teams = teams
+        self.index = {team: i for i, team in enumerate(teams)}
+        self.terms = terms
+
+    @classmethod
+    def from_stats(cls, stats: pd.DataFrame) -> 'MatchupMatrix':
+        return cls(stats['team_name'].tolist(), compute_matrix(stats))
+
+    def lookup(self, home_team: str, away_team: str, neutral: bool = False) -> Dict[str, float]:
+        """Baseline terms for one matchup; neutral=True drops home field advantage."""
+        h, a = self.index[home_team], self.index[away_team]
+        result = {name: values[h, a].item() for name, values in self.terms.items()}
+        if neutral:
+            result['expected_margin'] = result['expected_margin_neutral']
+        return result
+
+    def to_records(self, season: int, week: int) -> List[Dict[str, object]]:
+        """One row per ordered (home, away) pair, excluding a team against itself."""
+        n = len(self.teams)
+        home_idx, away_idx = np.nonzero(~np.eye(n, dtype=bool))
+        frame = pd.DataFrame({
+            'season': season,
+            'week': week,
+            'home_team': np.array(self.teams)[home_idx],
+            'away_team': np.array(self.teams)[away_idx],
+        })
+        for name, values in self.terms.items():
+            column = values[home_idx, away_idx]
+            frame[name] = column if values.dtype == bool else np.round(column, 2)
+        return frame.to_dict('records')
+
+
+def upsert_matrix(client: Client, records: List[Dict[str, object]]) -> None:
+    """Upsert matrix rows in chunks."""
+    chunk_size = 500
+    for i in range(0, len(records), chunk_size):
+        chunk = records[i : i + chunk_size]
+        client.table(MATRIX_TABLE).upsert(chunk, on_conflict='season,week,home_team,away_team').execute()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Precompute the matchup baseline matrix')
+    parser.add_argument('--season', type=int, default=2025)
+    parser.add_argument('--week', type=int, help='Use stats as of this week (default: latest)')
+    parser.add_argument('--show', nargs=2, metavar=('HOME', 'AWAY'), help='Print one matchup instead of uploading')
+    parser.add_argument('--neutral', action='store_true', help='With --show: neutral-site margin')
+    args = parser.parse_args(argv)
+
+    try:
+        client = get_supabase_client()
+        stats = load_team_stats(client, args.season, args.week)
+    except Exception as e:
+        print(f"❌ Error loading team stats: {e}")
+        return 1
+
+    if stats.empty:
+        print(f"❌ No team stats for {args.season}")
+        return 1
+
+    matrix = MatchupMatrix.from_stats(stats)
+    week = args.week or int(stats['week'].max())
+
+    if args.show:
+        home, away = args.show
+        for name, value in matrix.lookup(home, away, args.neutral).items():
+            print(f"  {name:<32} {value:>8.2f}" if not isinstance(value, bool) else f"  {name:<32} {value!s:>8}")
+        return 0
+
+    records = matrix.to_records(args.season, week)
+    print(f"Computed {len(records)} matchups for {len(matrix.teams)} teams (season {args.season}, week {week})")
+
+    try:
+        upsert_matrix(client, records)
+        print(f"✅ Saved to {MATRIX_TABLE}")
+    except Exception as e:
+        print(f"❌ Upload failed: {e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""
+Build a player identity index across nfl_data_py, Pro Football Reference and the Odds API.
+
+Player props arrive from the Odds API under display names ("Marvin Harrison Jr.",
+"DK Metcalf"), the PFR stat tables key on player_name + team_abbr, and
+player_stats_loader keys on the nfl_data_py player_id. This script maps every
+normalized name, suffix variant and initial variant to one canonical id along
+with the player's team history, and stores the result in player_identity_index
+so a whole slate of props can be resolved with a single bulk lookup.
+
+Usage:
+    python player_identity_index.py
+    python player_identity_index.py --seasons 2024 2025
+"""
+
+import argparse
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+INDEX_TABLE = 'player_identity_index'
+PFR_STAT_TABLES = ['player_passing_stats', 'player_rushing_stats', 'player_receiving_stats']
+DEFAULT_SEASON = 2025
+
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Minimum trigram (Jaccard) similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.6
+
+# nfl_data_py team codes -> Pro Football Reference codes used by the stat tables
+NFLDATA_TO_PFR_TEAM = {
+    'GB': 'GNB', 'KC': 'KAN', 'LV': 'LVR', 'NE': 'NWE', 'NO': 'NOR',
+    'SF': 'SFO', 'TB': 'TAM', 'LA': 'LAR', 'OAK': 'LVR', 'SD': 'LAC', 'STL': 'LAR',
+}
+
+# PFR season tables add a combined row ('2TM', '3TM', ...) for players who changed teams
+MULTI_TEAM_CODE = re.compile(r'^\d+TM$')
+
+PAGE_SIZE = 1000
+
+load_dotenv()
+
+
+def get_supabase_client() -> Client:
+    """Initialize Supabase client"""
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise Exception('Missing Supabase credentials in .env file')
+
+    return create_client(url, key)
+
+
+# ---------------------------------------------------------------------------
+# Name normalization (keep in sync with normalizePlayerName in predictPlayerProps.ts)
+# ---------------------------------------------------------------------------
+
+def name_tokens(name: str) -> List[str]:
+    """Lowercase, strip accents/punctuation and merge split initials ("D.K." -> "dk")."""
+    text = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii').lower()
+    text = re.sub(r"['’]", '', text)
+    text = re.sub(r'[^a-z0-9]+', ' ', text)
+
+    tokens: List[str] = []
+    in_initials = False
+    for token in text.split():
+        is_initial = len(token) == 1 and token.isalpha()
+        if is_initial and in_initials:
+            tokens[-1] += token
+        else:
+            tokens.append(token)
+        in_initials = is_initial
+    return tokens
+
+
+def normalize_name(name: str) -> str:
+    """Canonical lookup key: normalized tokens with generational suffixes dropped."""
+    tokens = [t for t in name_tokens(name) if t not in NAME_SUFFIXES]
+    return ' '.join(tokens)
+
+
+def name_variants(name: str) -> List[Tuple[str, str]]:
+    """All alias keys for a display name as (alias_key, alias_type) pairs."""
+    tokens = name_tokens(name)
+    base = [t for t in tokens if t not in NAME_SUFFIXES]
+    if not base:
+        return []
+
+    variants = [(' '.join(base), 'exact')]
+    if len(tokens) != len(base):
+        variants.append((' '.join(tokens), 'suffix'))
+    if len(base) >= 2 and len(base[0]) > 1:
+        # nfl_data_py abbreviates names as "P.Mahomes"
+        variants.append((' '.join([base[0][0]] + base[1:]), 'initial'))
+    return variants
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def to_pfr_team(team: str) -> str:
+    """PFR team code, or '' for missing teams and PFR multi-team totals ('2TM')."""
+    team = (team or '').upper().strip()
+    if MULTI_TEAM_CODE.match(team):
+        return ''
+    return NFLDATA_TO_PFR_TEAM.get(team, team)
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class PlayerIdentityIndex:
+    """In-memory alias -> canonical id index with trigram fuzzy fallback."""
+
+    def __init__(self) -> None:
+        self.players: Dict[str, Dict[str, object]] = {}
+        self.aliases: Dict[str, Set[str]] = defaultdict(set)
+        self.alias_types: Dict[Tuple[str, str], str] = {}
+        self._trigram_index: Dict[str, Set[str]] = defaultdict(set)
+
+    def add_player(self, canonical_id: str, name: str, position: str, teams: List[str], source: str) -> None:
+        """Register a player and all of their name variants.
+
+        teams must be chronological; a team is only skipped when it repeats the
+        latest one, so return trades (DEN -> NYJ -> DEN) keep DEN as current.
+        """
+        player = self.players.get(canonical_id)
+        if player is None:
+            player = {'canonical_id': canonical_id, 'player_name': name, 'position': position,
+                      'team_history': [], 'sources': []}
+            self.players[canonical_id] = player
+        for team in teams:
+            if team and player['team_history'][-1:] != [team]:
+                player['team_history'].append(team)
+        if source not in player['sources']:
+            player['sources'].append(source)
+        if not player['position'] and position:
+            player['position'] = position
+
+        for key, alias_type in name_variants(name):
+            if canonical_id not in self.aliases[key]:
+                self.aliases[key].add(canonical_id)
+                for gram in trigrams(key):
+                    self._trigram_index[gram].add(key)
+            # Prefer the strongest alias type when one key arrives from several names
+            existing = self.alias_types.get((key, canonical_id))
+            if existing is None or alias_type == 'exact':
+                self.alias_types[(key, canonical_id)] = alias_type
+
+    def _pick(self, candidates: Iterable[str], team: Optional[str], require_team: bool = False) -> Optional[str]:
+        team = to_pfr_team(team) if team else ''
+        candidates = list(candidates)
+        if require_team and team:
+            # Fuzzy hits must have played for the given team, even when there is only one
+            candidates = [c for c in candidates if team in self.players[c]['team_history']]
+        if len(candidates) == 1:
+            return candidates[0]
+        if team:
+            # Current team first, then anyone who has played for the team
+            current = [c for c in candidates if self.players[c]['team_history'][-1:] == [team]]
+            if len(current) == 1:
+                return current[0]
+            history = [c for c in candidates if team in self.players[c]['team_history']]
+            if len(history) == 1:
+                return history[0]
+        return None
+
+    def fuzzy_candidates(self, key: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Alias keys ranked by trigram similarity to key."""
+        grams = trigrams(key)
+        shared: Counter = Counter()
+        for gram in grams:
+            for alias in self._trigram_index.get(gram, ()):
+                shared[alias] += 1
+        scored = []
+        for alias, count in shared.items():
+            similarity = count / (len(grams) + len(trigrams(alias)) - count)
+            if similarity >= FUZZY_THRESHOLD:
+                scored.append((alias, similarity))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def resolve(self, name: str, team: Optional[str] = None) -> Optional[str]:
+        """Resolve a display name (optionally with team) to a canonical id."""
+        for key, _ in name_variants(name):
+            if key in self.aliases:
+                match = self._pick(self.aliases[key], team)
+                if match:
+                    return match
+        for alias, _ in self.fuzzy_candidates(normalize_name(name)):
+            match = self._pick(self.aliases[alias], team, require_team=True)
+            if match:
+                return match
+        return None
+
+    def resolve_many(self, names: Iterable[Tuple[str, Optional[str]]]) -> Dict[str, Optional[str]]:
+        """Resolve (name, team) pairs in one pass, caching repeated names."""
+        resolved: Dict[str, Optional[str]] = {}
+        for name, team in names:
+            if name not in resolved:
+                resolved[name] = self.resolve(name, team)
+        return resolved
+
+    def to_records(self, season: int) -> List[Dict[str, object]]:
+        """Flatten the index into player_identity_index rows."""
+        records = []
+        for key, ids in self.aliases.items():
+            for canonical_id in sorted(ids):
+                player = self.players[canonical_id]
+                history = player['team_history']
+                records.append({
+                    'alias_key': key,
+                    'canonical_id': canonical_id,
+                    'alias_type': self.alias_types[(key, canonical_id)],
+                    'is_ambiguous': len(ids) > 1,
+                    'player_name': player['player_name'],
+                    'position': player['position'] or None,
+                    'team': history[-1] if history else None,
+                    'team_history': history,
+                    'sources': player['sources'],
+                    'season': season,
+                })
+        return records
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+def load_nfl_data_players(seasons: List[int]) -> pd.DataFrame:
+    """One row per nfl_data_py player with their teams in chronological order."""
+    from nfl_data_py import import_weekly_data
+
+    weekly = import_weekly_data(seasons, columns=[
+        'player_id', 'player_name', 'player_display_name', 'position', 'recent_team', 'season', 'week',
+    ])
+    weekly = weekly.dropna(subset=['player_id'])
+    weekly['team'] = weekly['recent_team'].map(to_pfr_team)
+    weekly = weekly.sort_values(['player_id', 'season', 'week'])
+
+    grouped = weekly.groupby('player_id', sort=False)
+    players = grouped.agg(
+        player_display_name=('player_display_name', 'last'),
+        player_name=('player_name', 'last'),
+        position=('position', 'last'),
+    )
+    # Consecutive-duplicate removal keeps trades in order (e.g. DEN -> NYJ -> DEN)
+    players['teams'] = grouped['team'].agg(
+        lambda s: [t for i, t in enumerate(s) if t and (i == 0 or t != s.iloc[i - 1])]
+    )
+    return players.reset_index()
+
+
+def fetch_all(build_query) -> List[Dict[str, object]]:
+    """Page through a PostgREST query until it returns a short page."""
+    rows: List[Dict[str, object]] = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+def load_pfr_players(client: Client, season: int) -> List[Dict[str, str]]:
+    """player_name/team_abbr/position rows from the PFR stat tables."""
+    rows: List[Dict[str, str]] = []
+    for table in PFR_STAT_TABLES:
+        rows.extend(fetch_all(lambda: client.table(table)
+            .select('player_name, team_abbr, position')
+            .eq('season', season)
+            .order('player_name')))
+    return rows
+
+
+def build_index(client: Client, seasons: List[int]) -> PlayerIdentityIndex:
+    """Build the identity index from nfl_data_py and PFR sources."""
+    index = PlayerIdentityIndex()
+
+    print("Loading nfl_data_py players...")
+    players = load_nfl_data_players(seasons)
+    for row in players.itertuples(index=False):
+        name = row.player_display_name if isinstance(row.player_display_name, str) and row.player_display_name else row.player_name
+        index.add_player(str(row.player_id), name, str(row.position or ''), list(row.teams), 'nfl_data_py')
+    print(f"  {len(players)} players")
+
+    print("Loading PFR stat tables...")
+    pfr_rows = load_pfr_players(client, max(seasons))
+    matched = unmatched = 0
+    for row in pfr_rows:
+        name = row.get('player_name') or ''
+        # Multi-team total rows map to '' and only contribute the name; the
+        # player's single-team rows carry the actual teams
+        team = to_pfr_team(row.get('team_abbr') or '')
+        if not normalize_name(name):
+            continue
+        canonical_id = index.resolve(name, team or None)
+        if canonical_id is None:
+            canonical_id = f"pfr:{normalize_name(name).replace(' ', '-')}"
+            unmatched += 1
+        else:
+            matched += 1
+        # PFR rows carry no dates, so they only add teams nfl_data_py has not seen
+        known = index.players.get(canonical_id, {}).get('team_history', [])
+        teams = [team] if team and team not in known else []
+        index.add_player(canonical_id, name, (row.get('position') or '').upper(), teams, 'pfr')
+    print(f"  {matched} matched, {unmatched} PFR-only")
+
+    return index
+
+
+def upsert_index(client: Client, records: List[Dict[str, object]]) -> int:
+    """Upsert the rebuilt index in chunks, then delete aliases it no longer contains.
+
+    Pruning after the upsert (rather than deleting first) keeps the index
+    readable throughout a rebuild, while aliases of players who were cut or
+    traded stop resolving to a stale team. Returns the number of rows pruned.
+    """
+    chunk_size = 500
+    for i in range(0, len(records), chunk_size):
+        chunk = records[i : i + chunk_size]
+        client.table(INDEX_TABLE).upsert(chunk, on_conflict='alias_key,canonical_id').execute()
+
+    current = {(r['alias_key'], r['canonical_id']) for r in records}
+    existing = fetch_all(lambda: client.table(INDEX_TABLE)
+        .select('id, alias_key, canonical_id')
+        .order('id'))
+    stale_ids = [r['id'] for r in existing if (r['alias_key'], r['canonical_id']) not in current]
+
+    for i in range(0, len(stale_ids), chunk_size):
+        client.table(INDEX_TABLE).delete().in_('id', stale_ids[i : i + chunk_size]).execute()
+    return len(stale_ids)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Build the player identity index')
+    parser.add_argument('--seasons', type=int, nargs='+', default=[DEFAULT_SEASON])
+    args = parser.parse_args(argv)
+
+    try:
+        client = get_supabase_client()
+        index = build_index(client, args.seasons)
+    except Exception as e:
+        print(f"❌ Error building index: {e}")
+        return 1
+
+    records = index.to_records(max(args.seasons))
+    print(f"Uploading {len(records)} aliases for {len(index.players)} players...")
+
+    try:
+        pruned = upsert_index(client, records)
+        print(f"✅ Saved to {INDEX_TABLE} ({pruned} stale aliases removed)")
+    except Exception as e:
+        print(f"❌ Upload failed: {e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,13 @@
+import argparse
+import hashlib
+import json
 import os
 import sys
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
 
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 
@@ -18,6 +23,60 @@ except Exception as e:
 
 PREFERRED_SEASON = 2025  # Strictly require 2025
 DEFAULT_TABLE_NAME = os.getenv("PLAYER_STATS_TABLE", "player_stats_2025")
+PERCENTILES_TABLE_NAME = os.getenv("PLAYER_PERCENTILES_TABLE", "player_percentiles")
+CUTOFFS_TABLE_NAME = os.getenv("PLAYER_PERCENTILE_CUTOFFS_TABLE", "player_percentile_cutoffs")
+
+# Stage checkpoints let a failed run resume from the first stage whose inputs changed
+CHECKPOINT_DIR = os.getenv(
+    "PLAYER_STATS_CHECKPOINT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".checkpoints", "player_stats"),
+)
+# Downloaded nfl_data_py data is reused for this long before fetching again
+FETCH_MAX_AGE_HOURS = float(os.getenv("PLAYER_STATS_FETCH_MAX_AGE_HOURS", "6"))
+# Bump when stage logic changes so older checkpoints are not reused
+PIPELINE_VERSION = 2
+UPLOAD_CHUNK_SIZE = 500
+
+# Per-position selection metric and default cutoff (players kept per position).
+# Override cutoffs with PLAYER_STATS_CUTOFFS="QB=25,RB=30,WR=30,TE=15" or --cutoffs;
+# PLAYER_STATS_FULL_LEAGUE=1 or --full-league keeps every player instead.
+POSITION_METRICS: Dict[str, str] = {
+    "QB": "passing_yards",
+    "RB": "opportunities",
+    "WR": "targets",
+    "TE": "targets",
+}
+DEFAULT_CUTOFFS: Dict[str, int] = {"QB": 25, "RB": 30, "WR": 30, "TE": 15}
+
+# League percentile windows: season-to-date plus recent form (last N games played)
+PERCENTILE_WINDOWS: Dict[str, Optional[int]] = {"season": None, "last_3": 3, "last_5": 5}
+
+# Key stats ranked per position, and the subset averaged into the tier composite
+PERCENTILE_STATS: Dict[str, List[str]] = {
+    "QB": ["passing_yards_pg", "passing_tds_pg", "completions_pg", "attempts_pg",
+           "completion_pct", "yards_per_attempt", "rushing_yards_pg"],
+    "RB": ["rushing_yards_pg", "carries_pg", "yards_per_carry", "receptions_pg",
+           "receiving_yards_pg", "opportunities_pg", "total_tds_pg"],
+    "WR": ["receiving_yards_pg", "receptions_pg", "targets_pg", "catch_pct",
+           "yards_per_target", "receiving_tds_pg"],
+    "TE": ["receiving_yards_pg", "receptions_pg", "targets_pg", "catch_pct",
+           "yards_per_target", "receiving_tds_pg"],
+}
+TIER_STATS: Dict[str, List[str]] = {
+    "QB": ["passing_yards_pg", "passing_tds_pg", "yards_per_attempt"],
+    "RB": ["rushing_yards_pg", "opportunities_pg", "yards_per_carry"],
+    "WR": ["receiving_yards_pg", "targets_pg", "yards_per_target"],
+    "TE": ["receiving_yards_pg", "targets_pg", "yards_per_target"],
+}
+# Minimum per-game volume to be ranked; ratio stats on a handful of plays are noise
+QUALIFYING_VOLUME: Dict[str, Tuple[str, float]] = {
+    "QB": ("attempts_pg", 10.0),
+    "RB": ("opportunities_pg", 4.0),
+    "WR": ("targets_pg", 2.0),
+    "TE": ("targets_pg", 2.0),
+}
+# Composite percentile (0-1) at or above which each tier starts
+TIER_CUTS: Dict[str, float] = {"elite": 0.90, "starter": 0.60, "rotation": 0.30}
 
 
 def read_supabase_client() -> Client:
@@ -66,11 +125,16 @@ def fetch_weekly_data() -> pd.DataFrame:
     """Fetch weekly player data for the specified seasons."""
     print("Fetching data...")
     try:
-        weekly = import_weekly_data([PREFERRED_SEASON])
+        return import_weekly_data([PREFERRED_SEASON])
     except Exception as e:
         raise RuntimeError(
             "2025 data is not available from nfl_data_py yet. Please try again later."
         ) from e
+
+
+def normalize_weekly_data(weekly: pd.DataFrame) -> pd.DataFrame:
+    """Coalesce source column variants into the names used by later stages."""
+    weekly = weekly.copy()
     # Ensure expected columns exist or create them as 0
     # nfl_data_py uses specific column names; we coalesce common variants
     # Normalize a few important fields to consistent names used below
@@ -185,12 +249,7 @@ def aggregate_season_totals(weekly: pd.DataFrame) -> pd.DataFrame:
 def compute_last_three_averages(weekly: pd.DataFrame) -> pd.DataFrame:
     """Compute last 3 games averages for passing, rushing, receiving yards per player."""
     weekly_sorted = weekly.sort_values(["player_id", "week"])  # ascending
-    last3 = (
-        weekly_sorted
-        .groupby("player_id", as_index=False)
-        .apply(lambda g: g.tail(3))
-        .reset_index(drop=True)
-    )
+    last3 = weekly_sorted.groupby("player_id").tail(3)
 
     agg = last3.groupby("player_id")[
         ["passing_yards", "rushing_yards", "receiving_yards"]
@@ -205,31 +264,69 @@ def compute_last_three_averages(weekly: pd.DataFrame) -> pd.DataFrame:
     return agg
 
 
-def select_top_players(merged: pd.DataFrame) -> pd.DataFrame:
-    """Filter to Top 100 as specified by role-based criteria."""
-    # Derive selection metrics
+def parse_cutoffs(value: Optional[str]) -> Dict[str, int]:
+    """Parse "QB=25,RB=30" into a cutoff dict layered over DEFAULT_CUTOFFS."""
+    cutoffs = dict(DEFAULT_CUTOFFS)
+    for part in (value or "").split(","):
+        if not part.strip():
+            continue
+        position, _, count = part.partition("=")
+        position = position.strip().upper()
+        if position not in POSITION_METRICS or not count.strip().isdigit():
+            raise ValueError(f"Invalid cutoff '{part}', expected e.g. QB=25")
+        cutoffs[position] = int(count)
+    return cutoffs
+
+
+def add_usage_metrics(merged: pd.DataFrame) -> pd.DataFrame:
+    """Add team usage shares and within-position ranks for every player."""
     merged = merged.copy()
     merged["opportunities"] = merged["carries"].astype(float) + merged["targets"].astype(float)
 
     # Normalize positions (keep as given if already QB/RB/WR/TE)
     merged["position_norm"] = merged["position"].str.upper().str.strip()
 
-    # QBs: Top 25 by passing_yards
-    qbs = merged[merged["position_norm"] == "QB"].sort_values("passing_yards", ascending=False).head(25)
+    # Team shares: one grouped transform per column over the whole league
+    team_totals = merged.groupby("team")[["targets", "carries", "opportunities"]].transform("sum")
+    for column, share in [("targets", "target_share"), ("carries", "carry_share"), ("opportunities", "opportunity_share")]:
+        merged[share] = (merged[column] / team_totals[column]).where(team_totals[column] > 0, 0.0).round(4)
+
+    # Within-position rank on each position's selection metric (1 = most)
+    metric = pd.Series(0.0, index=merged.index)
+    for position, column in POSITION_METRICS.items():
+        is_position = merged["position_norm"] == position
+        metric[is_position] = merged.loc[is_position, column].astype(float)
+    other = ~merged["position_norm"].isin(list(POSITION_METRICS))
+    metric[other] = merged.loc[other, "opportunities"]
+    merged["position_rank"] = (
+        metric.groupby(merged["position_norm"]).rank(method="first", ascending=False).astype(int)
+    )
+    return merged
+
 
-    # RBs: Top 30 by carries + targets
-    rbs = merged[merged["position_norm"] == "RB"].sort_values("opportunities", ascending=False).head(30)
+def select_top_players(
+    merged: pd.DataFrame,
+    cutoffs: Optional[Dict[str, int]] = None,
+    full_league: bool = False,
+) -> pd.DataFrame:
+    """Keep the top players per position by role-based criteria, or everyone in full-league mode.
 
-    # WRs: Top 30 by targets
-    wrs = merged[merged["position_norm"] == "WR"].sort_values("targets", ascending=False).head(30)
+    Default cutoffs are 25 QBs by passing yards, 30 RBs by carries + targets,
+    30 WRs and 15 TEs by targets. Every kept row carries its team target,
+    carry and opportunity shares and its within-position rank.
+    """
+    ranked = add_usage_metrics(merged)
 
-    # TEs: Top 15 by targets
-    tes = merged[merged["position_norm"] == "TE"].sort_values("targets", ascending=False).head(15)
+    if full_league:
+        top = ranked
+    else:
+        limits = ranked["position_norm"].map(cutoffs or DEFAULT_CUTOFFS)
+        top = ranked[ranked["position_rank"] <= limits]
 
-    top = pd.concat([qbs, rbs, wrs, tes], ignore_index=True)
-    # Remove potential duplicates if a player is mispositioned
-    top = top.drop_duplicates(subset=["player_id"])  # keep first occurrence by priority order above
-    return top
+    # Remove potential duplicates if a player is mispositioned, preferring QB, RB, WR, TE
+    priority = top["position_norm"].map({p: i for i, p in enumerate(POSITION_METRICS)}).fillna(len(POSITION_METRICS))
+    top = top.assign(_priority=priority).sort_values(["_priority", "position_rank"], kind="stable")
+    return top.drop_duplicates(subset=["player_id"]).drop(columns="_priority").reset_index(drop=True)
 
 
 def build_records(df: pd.DataFrame, last3: pd.DataFrame) -> List[Dict[str, object]]:
@@ -267,41 +364,317 @@ def build_records(df: pd.DataFrame, last3: pd.DataFrame) -> List[Dict[str, objec
             "last_3_games_rushing_avg": safe_float(row.get("last_3_games_rushing_avg")),
             "last_3_games_receiving_avg": safe_float(row.get("last_3_games_receiving_avg")),
             "last_3_games_passing_avg": safe_float(row.get("last_3_games_passing_avg")),
+            "target_share": safe_float(row.get("target_share")),
+            "carry_share": safe_float(row.get("carry_share")),
+            "opportunity_share": safe_float(row.get("opportunity_share")),
+            "position_rank": safe_int(row.get("position_rank")),
         })
     return records
 
 
-def upsert_records(client: Client, table_name: str, records: List[Dict[str, object]]) -> None:
-    """Upsert records to Supabase with on_conflict on player_id."""
+def window_rates(weekly: pd.DataFrame, last_n: Optional[int]) -> pd.DataFrame:
+    """Per-game and efficiency rates per player over the season or their last N games."""
+    weekly = weekly.sort_values(["player_id", "week"])
+    if last_n:
+        weekly = weekly.groupby("player_id").tail(last_n)
+
+    grouped = weekly.groupby("player_id")
+    df = grouped[[
+        "passing_attempts", "passing_completions", "passing_yards", "passing_tds",
+        "carries", "rushing_yards", "rushing_tds",
+        "targets", "receptions", "receiving_yards", "receiving_tds",
+    ]].sum()
+    # Latest name/position/team, so traded players rank once under their current team
+    df[["player_name", "position", "team"]] = grouped[["player_name", "position", "team"]].last()
+    df["games"] = grouped.size()
+    df["position"] = df["position"].str.upper().str.strip()
+
+    def ratio(n: pd.Series, d: pd.Series) -> pd.Series:
+        return (n / d).where(d > 0)
+
+    games = df["games"]
+    df["passing_yards_pg"] = ratio(df["passing_yards"], games)
+    df["passing_tds_pg"] = ratio(df["passing_tds"], games)
+    df["completions_pg"] = ratio(df["passing_completions"], games)
+    df["attempts_pg"] = ratio(df["passing_attempts"], games)
+    df["completion_pct"] = ratio(df["passing_completions"], df["passing_attempts"]) * 100
+    df["yards_per_attempt"] = ratio(df["passing_yards"], df["passing_attempts"])
+    df["rushing_yards_pg"] = ratio(df["rushing_yards"], games)
+    df["carries_pg"] = ratio(df["carries"], games)
+    df["yards_per_carry"] = ratio(df["rushing_yards"], df["carries"])
+    df["receptions_pg"] = ratio(df["receptions"], games)
+    df["receiving_yards_pg"] = ratio(df["receiving_yards"], games)
+    df["targets_pg"] = ratio(df["targets"], games)
+    df["opportunities_pg"] = ratio(df["carries"] + df["targets"], games)
+    df["catch_pct"] = ratio(df["receptions"], df["targets"]) * 100
+    df["yards_per_target"] = ratio(df["receiving_yards"], df["targets"])
+    df["receiving_tds_pg"] = ratio(df["receiving_tds"], games)
+    df["total_tds_pg"] = ratio(df["rushing_tds"] + df["receiving_tds"], games)
+    return df.reset_index()
+
+
+def compute_percentiles(weekly: pd.DataFrame) -> pd.DataFrame:
+    """League percentile ranks and tiers per position for every window.
+
+    Percentiles (0-1) are ranked within (window, position) among players
+    meeting QUALIFYING_VOLUME; others keep NaN percentiles and the depth tier.
+    """
+    all_stats = sorted({s for stats in PERCENTILE_STATS.values() for s in stats})
+    frames = [window_rates(weekly, n).assign(window=name) for name, n in PERCENTILE_WINDOWS.items()]
+    df = pd.concat(frames, ignore_index=True)
+    df = df[df["position"].isin(list(PERCENTILE_STATS))].reset_index(drop=True)
+
+    qualified = pd.Series(False, index=df.index)
+    for position, (column, minimum) in QUALIFYING_VOLUME.items():
+        qualified |= (df["position"] == position) & (df[column] >= minimum)
+    df["qualified"] = qualified
+
+    # One grouped rank over every stat, window and position at once
+    pct_columns = [f"{s}_pct" for s in all_stats]
+    ranks = df[qualified].groupby(["window", "position"])[all_stats].rank(pct=True)
+    df[pct_columns] = ranks.reindex(df.index).to_numpy()
+
+    composite = pd.Series(np.nan, index=df.index)
+    for position, stats in TIER_STATS.items():
+        is_position = df["position"] == position
+        composite[is_position] = df.loc[is_position, [f"{s}_pct" for s in stats]].mean(axis=1)
+    df["composite_pct"] = composite.where(qualified).groupby([df["window"], df["position"]]).rank(pct=True)
+
+    cuts = list(TIER_CUTS.items())
+    df["tier"] = np.select([df["composite_pct"] >= cut for _, cut in cuts], [tier for tier, _ in cuts], default="depth")
+    return df
+
+
+def round_or_none(value: object, digits: int) -> Optional[float]:
+    return None if pd.isna(value) else round(float(value), digits)
+
+
+def build_percentile_records(df: pd.DataFrame) -> List[Dict[str, object]]:
+    """Compact rows: one per player and window with the position's stats and percentiles."""
+    records: List[Dict[str, object]] = []
+    for position, stats in PERCENTILE_STATS.items():
+        for row in df[df["position"] == position].to_dict("records"):
+            records.append({
+                "player_id": str(row["player_id"]),
+                "season": PREFERRED_SEASON,
+                "stat_window": row["window"],
+                "player_name": row["player_name"],
+                "position": position,
+                "team": row["team"] or None,
+                "games": safe_int(row["games"]),
+                "stats": {s: round_or_none(row[s], 2) for s in stats},
+                "percentiles": {s: round_or_none(row[f"{s}_pct"] * 100, 1) for s in stats},
+                "composite_percentile": round_or_none(row["composite_pct"] * 100, 1),
+                "tier": row["tier"],
+            })
+    return records
+
+
+def build_cutoff_records(df: pd.DataFrame) -> List[Dict[str, object]]:
+    """Stat value at which each tier starts, per window, position and stat (qualified players)."""
+    records: List[Dict[str, object]] = []
+    for position, stats in PERCENTILE_STATS.items():
+        qualified = df[(df["position"] == position) & df["qualified"]]
+        if qualified.empty:
+            continue
+        quantiles = qualified.groupby("window")[stats].quantile(list(TIER_CUTS.values()))
+        for window in quantiles.index.get_level_values(0).unique():
+            window_cuts = quantiles.loc[window]
+            for stat in stats:
+                record: Dict[str, object] = {
+                    "season": PREFERRED_SEASON,
+                    "stat_window": window,
+                    "position": position,
+                    "stat": stat,
+                }
+                for tier, cut in TIER_CUTS.items():
+                    record[f"{tier}_min"] = round_or_none(window_cuts.loc[cut, stat], 2)
+                records.append(record)
+    return records
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a DataFrame (columns and values, not index)."""
+    digest = hashlib.sha256(",".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def stage_key(stage: str, *inputs: object) -> str:
+    """Fingerprint of a stage's inputs: upstream fingerprints plus parameters."""
+    payload = json.dumps([stage, PIPELINE_VERSION, *inputs], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """Parquet checkpoint per stage plus a JSON sidecar recording its input key."""
+
+    def __init__(self, directory: str, enabled: bool = True) -> None:
+        self.directory = directory
+        self.enabled = enabled
+        if enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read_json(self, name: str) -> Optional[Dict[str, object]]:
+        try:
+            with open(self._path(name)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_json(self, name: str, payload: Dict[str, object]) -> None:
+        tmp = self._path(name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, self._path(name))
+
+    def load(self, stage: str, key: str, max_age_hours: Optional[float] = None) -> Optional[Tuple[pd.DataFrame, str]]:
+        """Return (frame, fingerprint) if the stage was last run with the same key."""
+        if not self.enabled:
+            return None
+        meta = self._read_json(f"{stage}.json")
+        if not meta or meta.get("key") != key:
+            return None
+        if max_age_hours is not None and time.time() - float(meta.get("created_at", 0)) > max_age_hours * 3600:
+            return None
+        try:
+            return pd.read_parquet(self._path(f"{stage}.parquet")), str(meta["fingerprint"])
+        except Exception:
+            # Missing or unreadable checkpoint: recompute the stage
+            return None
+
+    def save(self, stage: str, key: str, df: pd.DataFrame) -> str:
+        fingerprint = frame_fingerprint(df)
+        if self.enabled:
+            tmp = self._path(f"{stage}.parquet.tmp")
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, self._path(f"{stage}.parquet"))
+            self._write_json(f"{stage}.json", {
+                "key": key,
+                "fingerprint": fingerprint,
+                "rows": len(df),
+                "created_at": time.time(),
+            })
+        return fingerprint
+
+    def committed_chunks(self, key: str, name: str = "upload") -> List[int]:
+        """Upload chunks already committed for this upload key."""
+        manifest = self._read_json(f"{name}.json") if self.enabled else None
+        if not manifest or manifest.get("key") != key:
+            return []
+        return [int(i) for i in manifest.get("committed", [])]
+
+    def mark_committed(self, key: str, committed: List[int], name: str = "upload") -> None:
+        if self.enabled:
+            self._write_json(f"{name}.json", {"key": key, "committed": sorted(committed)})
+
+
+def run_stage(
+    store: CheckpointStore,
+    stage: str,
+    inputs: List[object],
+    compute: Callable[[], pd.DataFrame],
+    max_age_hours: Optional[float] = None,
+    force: bool = False,
+) -> Tuple[pd.DataFrame, str]:
+    """Reuse the stage checkpoint if its inputs are unchanged, else compute and save it."""
+    key = stage_key(stage, *inputs)
+    cached = None if force else store.load(stage, key, max_age_hours)
+    if cached is not None:
+        print(f"  {stage}: reused checkpoint ({len(cached[0])} rows)")
+        return cached
+    df = compute()
+    fingerprint = store.save(stage, key, df)
+    print(f"  {stage}: {len(df)} rows")
+    return df, fingerprint
+
+
+def records_from_frame(df: pd.DataFrame) -> List[Dict[str, object]]:
+    """Convert the build checkpoint back to plain Python dicts for upload."""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def upsert_records(
+    client: Client,
+    table_name: str,
+    records: List[Dict[str, object]],
+    store: Optional[CheckpointStore] = None,
+    upload_key: str = "",
+    on_conflict: str = "player_id",
+    manifest: str = "upload",
+) -> None:
+    """Upsert records to Supabase (on_conflict on player_id by default).
+
+    With a checkpoint store, chunks committed by an earlier run with the same
+    upload key are skipped, so a retry only sends what is left.
+    """
     if not records:
         print("No records to upload.")
         return
     # Supabase recommends batching; choose a reasonable chunk size
-    chunk_size = 500
-    for i in range(0, len(records), chunk_size):
+    chunk_size = UPLOAD_CHUNK_SIZE
+    committed = store.committed_chunks(upload_key, manifest) if store else []
+    if committed:
+        print(f"Skipping {len(committed)} chunk(s) committed by a previous run")
+    for index, i in enumerate(range(0, len(records), chunk_size)):
+        if index in committed:
+            continue
         chunk = records[i : i + chunk_size]
-        client.table(table_name).upsert(chunk, on_conflict="player_id").execute()
+        client.table(table_name).upsert(chunk, on_conflict=on_conflict).execute()
+        committed.append(index)
+        if store:
+            store.mark_committed(upload_key, committed, manifest)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load 2025 player stats into Supabase")
+    parser.add_argument("--refresh", action="store_true", help="Re-download from nfl_data_py even if a recent fetch is checkpointed")
+    parser.add_argument("--no-checkpoints", action="store_true", help="Run every stage without reading or writing checkpoints")
+    parser.add_argument("--full-league", action="store_true", default=os.getenv("PLAYER_STATS_FULL_LEAGUE") == "1",
+                        help="Load every player instead of the per-position top cut")
+    parser.add_argument("--cutoffs", default=os.getenv("PLAYER_STATS_CUTOFFS"),
+                        help="Players kept per position, e.g. QB=32,RB=48,WR=64,TE=32")
+    args = parser.parse_args(argv)
 
+    try:
+        cutoffs = parse_cutoffs(args.cutoffs)
+    except ValueError as e:
+        print(e)
+        return 1
 
-def main() -> int:
     try:
         client = read_supabase_client()
     except Exception as e:
         print(f"Failed to init Supabase: {e}")
         return 1
 
+    store = CheckpointStore(CHECKPOINT_DIR, enabled=not args.no_checkpoints)
+
     try:
-        weekly = fetch_weekly_data()
+        weekly_raw, fetch_fp = run_stage(
+            store, "fetch", [PREFERRED_SEASON], fetch_weekly_data,
+            max_age_hours=FETCH_MAX_AGE_HOURS, force=args.refresh,
+        )
     except Exception as e:
         print(f"Error fetching data: {e}")
         return 1
 
     try:
-        totals = aggregate_season_totals(weekly)
-        last3 = compute_last_three_averages(weekly)
-        top100 = select_top_players(totals)
-        print(f"Processing {len(top100)} players...")
-        records = build_records(top100, last3)
+        weekly, normalize_fp = run_stage(store, "normalize", [fetch_fp], lambda: normalize_weekly_data(weekly_raw))
+        totals, aggregate_fp = run_stage(store, "aggregate", [normalize_fp], lambda: aggregate_season_totals(weekly))
+        last3, last_n_fp = run_stage(store, "last_n", [normalize_fp], lambda: compute_last_three_averages(weekly))
+        selected, select_fp = run_stage(
+            store, "select", [aggregate_fp, cutoffs, args.full_league],
+            lambda: select_top_players(totals, cutoffs, args.full_league),
+        )
+        print(f"Processing {len(selected)} players...")
+        built, build_fp = run_stage(
+            store, "build", [select_fp, last_n_fp], lambda: pd.DataFrame(build_records(selected, last3))
+        )
+        records = records_from_frame(built)
     except Exception as e:
         print(f"Error processing data: {e}")
         return 1
@@ -311,10 +684,29 @@ def main() -> int:
     table_name = DEFAULT_TABLE_NAME
 
     try:
-        upsert_records(client, table_name, records)
+        upload_key = stage_key("upload", build_fp, table_name, UPLOAD_CHUNK_SIZE)
+        upsert_records(client, table_name, records, store, upload_key)
         print("Uploaded to Supabase")
+
+        percentiles, percentiles_fp = run_stage(store, "percentiles", [normalize_fp], lambda: compute_percentiles(weekly))
+        percentile_records = build_percentile_records(percentiles)
+        upload_key = stage_key("upload_percentiles", percentiles_fp, PERCENTILES_TABLE_NAME, UPLOAD_CHUNK_SIZE)
+        upsert_records(
+            client, PERCENTILES_TABLE_NAME, percentile_records, store, upload_key,
+            on_conflict="player_id,season,stat_window", manifest="upload_percentiles",
+        )
+        print(f"Uploaded {len(percentile_records)} percentile rows to {PERCENTILES_TABLE_NAME}")
+
+        cutoff_records = build_cutoff_records(percentiles)
+        upload_key = stage_key("upload_cutoffs", percentiles_fp, CUTOFFS_TABLE_NAME, UPLOAD_CHUNK_SIZE)
+        upsert_records(
+            client, CUTOFFS_TABLE_NAME, cutoff_records, store, upload_key,
+            on_conflict="season,stat_window,position,stat", manifest="upload_cutoffs",
+        )
+        print(f"Uploaded {len(cutoff_records)} tier cut points to {CUTOFFS_TABLE_NAME}")
     except Exception as e:
         print(f"Upload failed: {e}")
+        print("Rerun to resume; committed chunks and finished stages will be skipped.")
         return 1
 
     return 0
@@ -322,6 +714,3 @@ def main() -> int:
 
 if __name__ == "__main__":
     sys.exit(main())
-
-
-
@@ -8,6 +8,8 @@ from bs4 import BeautifulSoup
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from table_cache_service import invalidate_cache
+
 # Load environment variables
 load_dotenv()
 
@@ -187,6 +189,9 @@ def main():
         # Save to database
         save_to_database(teams)
         
+        # Drop stale standings from the local table cache, if one is running
+        invalidate_cache(['auto_nfl_team_stats'])
+        
         print("✅ All done!\n")
         
     except Exception as e:
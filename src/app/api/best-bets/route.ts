@@ -1,6 +1,7 @@
 import { NextResponse } from 'next/server';
 import { getBestBetsFromDatabase, generateAndSavePredictions } from '@/lib/predictGames';
 import { getTeamStats } from '@/lib/fetchNFLStats';
+import { getSlateSnapshot, SLATE_CACHE_CONTROL } from '@/lib/slateSnapshot';
 
 export const dynamic = 'force-dynamic';
 
@@ -49,6 +50,29 @@ export async function GET(request: Request) {
 		if (typeParam) console.log(`   Type: ${typeParam}`);
 		console.log(`${'='.repeat(60)}\n`);
 
+		// Fast path: serve the precomputed weekly slate when one exists
+		if (typeof week === 'number') {
+			const snapshot = await getSlateSnapshot(week, season);
+			if (snapshot && snapshot.spreads.length > 0) {
+				const picks = snapshot.spreads.slice(0, limit);
+				console.log(`✅ Served ${picks.length} spread picks from slate snapshot (${snapshot.generated_at})\n`);
+
+				const response: BestBetsResponse = {
+					success: true,
+					message: `Found ${picks.length} ${typeParam === 'spreads' ? 'spread' : ''} bet${picks.length > 1 ? 's' : ''} with betting value`,
+					predictions: picks,
+					analyzed: picks.length,
+					recommendations: picks.length,
+					generated_at: snapshot.generated_at,
+				};
+
+				return NextResponse.json(response, {
+					status: 200,
+					headers: { 'Cache-Control': SLATE_CACHE_CONTROL },
+				});
+			}
+		}
+
 		// Fetch ALL predictions for the week (including those with recommended_bet='none')
 		// This allows us to rank by quality and show top 5 even if fewer meet strict criteria
 		const { createClient } = await import('@supabase/supabase-js');
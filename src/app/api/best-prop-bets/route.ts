@@ -1,5 +1,6 @@
 import { NextResponse } from 'next/server';
 import { getBestPropBets } from '@/lib/predictPlayerProps';
+import { getSlateSnapshot, SLATE_CACHE_CONTROL } from '@/lib/slateSnapshot';
 import { createClient } from '@supabase/supabase-js';
 
 const getSupabaseClient = () => {
@@ -65,6 +66,29 @@ export async function GET(request: Request) {
     const curatedPropIds = [5211, 5326, 5205, 5176, 5248, 5066, 4417, 5270, 5274, 5219];
     const isCuratedWeek = week === 11 && season === 2025;
     
+    // Fast path: serve the precomputed weekly slate when one exists.
+    // Position/market filters and the curated week still use live queries.
+    if (typeof week === 'number' && !isCuratedWeek && !positionParam && !marketParam) {
+      const snapshot = await getSlateSnapshot(week, season);
+      if (snapshot && snapshot.props.length > 0) {
+        const picks = snapshot.props.slice(0, limit);
+        console.log(`✅ Served ${picks.length} prop picks from slate snapshot (${snapshot.generated_at})\n`);
+
+        const response: BestPropBetsResponse = {
+          success: true,
+          message: `Found ${picks.length} recommended player prop bet${picks.length > 1 ? 's' : ''}`,
+          predictions: picks,
+          total: picks.length,
+          generated_at: snapshot.generated_at,
+        };
+
+        return NextResponse.json(response, {
+          status: 200,
+          headers: { 'Cache-Control': SLATE_CACHE_CONTROL },
+        });
+      }
+    }
+    
     let predictions: any[] = [];
     
     if (isCuratedWeek) {
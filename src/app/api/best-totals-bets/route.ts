@@ -1,5 +1,6 @@
 import { NextResponse } from 'next/server';
 import { getBestTotalsBets } from '@/lib/predictTotals';
+import { getSlateSnapshot, SLATE_CACHE_CONTROL } from '@/lib/slateSnapshot';
 
 export const dynamic = 'force-dynamic';
 
@@ -34,6 +35,27 @@ export async function GET(request: Request) {
     if (season) console.log(`   Season: ${season}`);
     console.log(`${'='.repeat(60)}\n`);
 
+    // Fast path: serve the precomputed weekly slate when one exists
+    const snapshot = typeof week === 'number' ? await getSlateSnapshot(week, season) : null;
+    if (snapshot && snapshot.totals.length > 0) {
+      const picks = snapshot.totals.slice(0, limit);
+      console.log(`✅ Served ${picks.length} totals picks from slate snapshot (${snapshot.generated_at})\n`);
+
+      return NextResponse.json(
+        {
+          success: true,
+          message: `Found ${picks.length} recommended Over/Under bets`,
+          predictions: picks,
+          count: picks.length,
+          generated_at: snapshot.generated_at,
+        },
+        {
+          status: 200,
+          headers: { 'Cache-Control': SLATE_CACHE_CONTROL },
+        }
+      );
+    }
+
     const predictions = await getBestTotalsBets(limit, week, season);
 
     console.log(`✅ Found ${predictions.length} recommended totals bets\n`);
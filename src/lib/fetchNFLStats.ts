@@ -1,5 +1,6 @@
 import { createClient } from '@supabase/supabase-js';
 import * as cheerio from 'cheerio';
+import { cachedSelect } from './tableCache';
 
 // Initialize Supabase client
 const getSupabaseClient = () => {
@@ -643,7 +644,17 @@ export async function getTeamStats(
     
     query = query.order('week', { ascending: false }).limit(1);
     
-    const { data, error } = await query.single();
+    // Served from the local table cache when it is running
+    const cached = await cachedSelect('auto_nfl_team_stats', {
+      team_name: `eq.${teamName}`,
+      week: weekNumber ? `eq.${weekNumber}` : undefined,
+      order: 'week.desc',
+      limit: '1',
+    });
+    
+    const { data, error } = cached
+      ? { data: cached[0] ?? null, error: cached.length > 0 ? null : 'No rows in table cache' }
+      : await query.single();
     
     if (error) {
       console.error(`Error fetching stats for ${teamName}:`, error);
@@ -1,5 +1,6 @@
 import { createClient } from '@supabase/supabase-js';
 import { NFLTeamStats, getTeamStats } from './fetchNFLStats';
+import { cachedSelect } from './tableCache';
 
 // Initialize Supabase client
 const getSupabaseClient = () => {
@@ -88,14 +89,23 @@ async function calculateDefensiveScore(stats: NFLTeamStats, teamName: string): P
   let ypdScore = 0;
   let hasRealYPP = false;
   
+  const cachedDefense = await cachedSelect('team_defense_stats', {
+    team_name: `eq.${teamName}`,
+    select: 'yards_per_play',
+    order: 'week.desc',
+    limit: '1',
+  });
+  
   const supabase = getSupabaseClient();
-  const { data: defenseStats } = await supabase
-    .from('team_defense_stats')
-    .select('yards_per_play')
-    .eq('team_name', teamName)
-    .order('week', { ascending: false })
-    .limit(1)
-    .maybeSingle();
+  const { data: defenseStats } = cachedDefense
+    ? { data: cachedDefense[0] ?? null }
+    : await supabase
+      .from('team_defense_stats')
+      .select('yards_per_play')
+      .eq('team_name', teamName)
+      .order('week', { ascending: false })
+      .limit(1)
+      .maybeSingle();
   
   if (defenseStats && defenseStats.yards_per_play != null) {
     // Use REAL yards per play data
@@ -264,12 +274,20 @@ async function calculateInjuryImpact(teamAbbr: string): Promise<{
   
   try {
     // Get injured players who are OUT (game_status = 'Out')
-    const { data: injuries, error: injuryError } = await supabase
-      .from('injuries')
-      .select('player_name, position, team_abbr, game_status')
-      .eq('team_abbr', teamAbbr)
-      .eq('season', 2025)
-      .eq('game_status', 'Out'); // Only players with game_status = 'Out'
+    const cachedInjuries = await cachedSelect('injuries', {
+      team_abbr: `eq.${teamAbbr}`,
+      season: 'eq.2025',
+      game_status: 'eq.Out',
+      select: 'player_name,position,team_abbr,game_status',
+    });
+    const { data: injuries, error: injuryError } = cachedInjuries
+      ? { data: cachedInjuries, error: null }
+      : await supabase
+        .from('injuries')
+        .select('player_name, position, team_abbr, game_status')
+        .eq('team_abbr', teamAbbr)
+        .eq('season', 2025)
+        .eq('game_status', 'Out'); // Only players with game_status = 'Out'
     
     if (injuryError || !injuries || injuries.length === 0) {
       return { 
@@ -280,13 +298,22 @@ async function calculateInjuryImpact(teamAbbr: string): Promise<{
     }
     
     // Get snap counts for the injured players
-    const { data: snapCounts, error: snapError } = await supabase
-      .from('snap_counts')
-      .select('player_name, position, offensive_snap_pct, defensive_snap_pct, team_abbr')
-      .eq('team_abbr', teamAbbr)
-      .eq('season', 2025)
-      .order('week_number', { ascending: false })
-      .limit(100); // Get recent snap counts
+    const cachedSnaps = await cachedSelect('snap_counts', {
+      team_abbr: `eq.${teamAbbr}`,
+      season: 'eq.2025',
+      select: 'player_name,position,offensive_snap_pct,defensive_snap_pct,team_abbr',
+      order: 'week_number.desc',
+      limit: '100',
+    });
+    const { data: snapCounts, error: snapError } = cachedSnaps
+      ? { data: cachedSnaps, error: null }
+      : await supabase
+        .from('snap_counts')
+        .select('player_name, position, offensive_snap_pct, defensive_snap_pct, team_abbr')
+        .eq('team_abbr', teamAbbr)
+        .eq('season', 2025)
+        .order('week_number', { ascending: false })
+        .limit(100); // Get recent snap counts
     
     if (snapError || !snapCounts) {
       // If no snap count data, use legacy simplified calculation
@@ -1,4 +1,5 @@
 import { createClient } from '@supabase/supabase-js';
+import { cachedSelect } from './tableCache';
 
 // Initialize Supabase client
 const getSupabaseClient = () => {
@@ -86,12 +87,258 @@ const TEAM_ABBR_MAP: Record<string, string> = {
   'Tennessee Titans': 'TEN', 'Washington Commanders': 'WAS',
 };
 
+const NAME_SUFFIXES = new Set(['jr', 'sr', 'ii', 'iii', 'iv', 'v']);
+
+/**
+ * Normalize a player name to a player_identity_index alias key
+ * (keep in sync with normalize_name in player_identity_index.py)
+ */
+export function normalizePlayerName(name: string): string {
+  const text = (name || '')
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/['’]/g, '')
+    .replace(/[^a-z0-9]+/g, ' ');
+  
+  // Merge split initials: "d k metcalf" -> "dk metcalf"
+  const tokens: string[] = [];
+  let inInitials = false;
+  for (const token of text.split(' ').filter(Boolean)) {
+    const isInitial = token.length === 1 && /[a-z]/.test(token);
+    if (isInitial && inInitials) {
+      tokens[tokens.length - 1] += token;
+    } else {
+      tokens.push(token);
+    }
+    inInitials = isInitial;
+  }
+  
+  return tokens.filter(t => !NAME_SUFFIXES.has(t)).join(' ');
+}
+
+interface PlayerIdentity {
+  canonical_id: string;
+  team: string | null;
+  position: string | null;
+}
+
+// alias_key -> candidate identities, filled by preloadPlayerIdentities()
+const playerIdentityCache = new Map<string, PlayerIdentity[]>();
+
+/**
+ * Resolve a whole slate of player names with one bulk player_identity_index lookup.
+ * getPlayerTeam() serves preloaded names from memory instead of querying
+ * the passing, rushing and receiving tables one by one.
+ */
+export async function preloadPlayerIdentities(playerNames: string[]): Promise<number> {
+  const supabase = getSupabaseClient();
+  const keys = Array.from(new Set(playerNames.map(normalizePlayerName).filter(Boolean)))
+    .filter(key => !playerIdentityCache.has(key));
+  
+  if (keys.length === 0) return 0;
+  
+  const { data, error } = await supabase
+    .from('player_identity_index')
+    .select('alias_key, canonical_id, team, position')
+    .in('alias_key', keys);
+  
+  if (error) {
+    console.error('Error preloading player identities:', error);
+    return 0;
+  }
+  
+  for (const key of keys) playerIdentityCache.set(key, []);
+  for (const row of data || []) {
+    playerIdentityCache.get(row.alias_key)?.push({
+      canonical_id: row.canonical_id,
+      team: row.team,
+      position: row.position,
+    });
+  }
+  
+  return (data || []).length;
+}
+
+type PercentileWindow = 'season' | 'last_3' | 'last_5';
+type PercentileTier = 'elite' | 'starter' | 'rotation' | 'depth';
+
+interface PlayerPercentiles {
+  position: string;
+  games: number;
+  stats: Record<string, number | null>;
+  percentiles: Record<string, number | null>;
+  composite_percentile: number | null;
+  tier: PercentileTier;
+}
+
+interface PercentileCutoff {
+  elite_min: number | null;
+  starter_min: number | null;
+  rotation_min: number | null;
+}
+
+// canonical_id -> stat_window -> league percentiles, filled by preloadPlayerPercentiles()
+const playerPercentileCache = new Map<string, Map<string, PlayerPercentiles>>();
+// `${stat_window}:${position}:${stat}` -> stat value at which each tier starts
+const percentileCutoffCache = new Map<string, PercentileCutoff>();
+
+// Windows read by prop scoring; preloading only these keeps rows per player down
+const SCORED_PERCENTILE_WINDOWS: PercentileWindow[] = ['season', 'last_3'];
+
+// player_ids per percentile query, and PostgREST's row cap per page
+const PERCENTILE_ID_CHUNK_SIZE = 200;
+const PERCENTILE_PAGE_SIZE = 1000;
+
+// Percentile (0-100) at which each tier starts; keep in sync with TIER_CUTS in player_stats_loader.py
+const PERCENTILE_TIER_CUTS: [PercentileTier, number][] = [['elite', 90], ['starter', 60], ['rotation', 30]];
+
+// Prop market -> stat key in player_percentiles.stats / percentiles
+const PERCENTILE_STAT_BY_MARKET: Record<string, { stat: string; label: string }> = {
+  'player_pass_yds': { stat: 'passing_yards_pg', label: 'pass yds' },
+  'player_pass_tds': { stat: 'passing_tds_pg', label: 'pass TDs' },
+  'player_pass_completions': { stat: 'completions_pg', label: 'completions' },
+  'player_pass_attempts': { stat: 'attempts_pg', label: 'attempts' },
+  'player_rush_yds': { stat: 'rushing_yards_pg', label: 'rush yds' },
+  'player_rush_attempts': { stat: 'carries_pg', label: 'rush att' },
+  'player_reception_yds': { stat: 'receiving_yards_pg', label: 'rec yds' },
+  'player_receptions': { stat: 'receptions_pg', label: 'rec' },
+};
+
+// Efficiency stats whose percentiles stand in for consistency, by position
+const CONSISTENCY_STATS: Record<string, string[]> = {
+  QB: ['completion_pct', 'yards_per_attempt'],
+  RB: ['yards_per_carry'],
+  WR: ['catch_pct', 'yards_per_target'],
+  TE: ['catch_pct', 'yards_per_target'],
+};
+
+function percentileTier(percentile: number | null | undefined): PercentileTier {
+  for (const [tier, cut] of PERCENTILE_TIER_CUTS) {
+    if (percentile != null && percentile >= cut) return tier;
+  }
+  return 'depth';
+}
+
+/**
+ * Load league percentiles and tier cut points (written by player_stats_loader.py)
+ * for every preloaded identity, so tier checks and stat scoring are in-memory
+ * lookups. Call after preloadPlayerIdentities().
+ */
+export async function preloadPlayerPercentiles(): Promise<number> {
+  const supabase = getSupabaseClient();
+  
+  if (percentileCutoffCache.size === 0) {
+    const { data: cutoffs, error } = await supabase
+      .from('player_percentile_cutoffs')
+      .select('stat_window, position, stat, elite_min, starter_min, rotation_min')
+      .eq('season', 2025)
+      .in('stat_window', SCORED_PERCENTILE_WINDOWS);
+    if (error) {
+      console.error('Error preloading percentile cutoffs:', error);
+    }
+    for (const row of cutoffs || []) {
+      percentileCutoffCache.set(`${row.stat_window}:${row.position}:${row.stat}`, {
+        elite_min: row.elite_min,
+        starter_min: row.starter_min,
+        rotation_min: row.rotation_min,
+      });
+    }
+  }
+  
+  const ids = new Set<string>();
+  for (const identities of playerIdentityCache.values()) {
+    for (const identity of identities) {
+      if (!playerPercentileCache.has(identity.canonical_id)) ids.add(identity.canonical_id);
+    }
+  }
+  
+  const idList = Array.from(ids);
+  let loaded = 0;
+  
+  for (let i = 0; i < idList.length; i += PERCENTILE_ID_CHUNK_SIZE) {
+    const chunk = idList.slice(i, i + PERCENTILE_ID_CHUNK_SIZE);
+    const rows: any[] = [];
+    
+    // Page so PostgREST's row cap can never silently drop players
+    for (let start = 0; ; start += PERCENTILE_PAGE_SIZE) {
+      const { data, error } = await supabase
+        .from('player_percentiles')
+        .select('player_id, stat_window, position, games, stats, percentiles, composite_percentile, tier')
+        .in('player_id', chunk)
+        .in('stat_window', SCORED_PERCENTILE_WINDOWS)
+        .eq('season', 2025)
+        .order('player_id')
+        .order('stat_window')
+        .range(start, start + PERCENTILE_PAGE_SIZE - 1);
+      
+      if (error) {
+        // Leave this chunk uncached so its players fall back to the stat tables
+        console.error('Error preloading player percentiles:', error);
+        return loaded;
+      }
+      
+      rows.push(...(data || []));
+      if (!data || data.length < PERCENTILE_PAGE_SIZE) break;
+    }
+    
+    for (const id of chunk) playerPercentileCache.set(id, new Map());
+    for (const row of rows) {
+      playerPercentileCache.get(row.player_id)?.set(row.stat_window, {
+        position: row.position,
+        games: row.games || 0,
+        stats: row.stats || {},
+        percentiles: row.percentiles || {},
+        composite_percentile: row.composite_percentile,
+        tier: row.tier,
+      });
+    }
+    loaded += rows.length;
+  }
+  
+  return loaded;
+}
+
+/**
+ * Preloaded league percentiles for a player, or null when the player is not
+ * in the identity index or has no row for the window.
+ */
+function getPlayerPercentiles(
+  playerName: string,
+  teamAbbr: string,
+  window: PercentileWindow = 'season'
+): PlayerPercentiles | null {
+  const identities = playerIdentityCache.get(normalizePlayerName(playerName));
+  if (!identities || identities.length === 0) return null;
+  
+  const candidates = identities.length > 1
+    ? identities.filter(p => p.team === teamAbbr)
+    : identities;
+  if (candidates.length !== 1) return null;
+  
+  return playerPercentileCache.get(candidates[0].canonical_id)?.get(window) ?? null;
+}
+
 /**
  * Get player's team from their stats (check all position tables)
  */
-async function getPlayerTeam(playerName: string): Promise<{ team: string; position: string } | null> {
+async function getPlayerTeam(
+  playerName: string,
+  gameTeams: string[] = []
+): Promise<{ team: string; position: string } | null> {
   const supabase = getSupabaseClient();
   
+  // Preloaded identity index: disambiguate shared names by the teams in the game
+  const identities = playerIdentityCache.get(normalizePlayerName(playerName));
+  if (identities && identities.length > 0) {
+    const candidates = identities.length > 1
+      ? identities.filter(p => p.team && gameTeams.includes(p.team))
+      : identities;
+    if (candidates.length === 1 && candidates[0].team && candidates[0].position) {
+      return { team: candidates[0].team, position: candidates[0].position };
+    }
+  }
+  
   // Try passing stats first (QBs)
   const { data: qbData } = await supabase
     .from('player_passing_stats')
@@ -228,6 +475,97 @@ async function validateReasoningPlayerReferences(
   return cleanedReasoning;
 }
 
+/**
+ * Player stats score from the preloaded league percentiles: the season per-game
+ * value for the market, efficiency percentiles for consistency, and the tier
+ * cut points for context. Null when the player has no ranked value for the
+ * market, so the caller falls back to the stat tables.
+ */
+function scoreFromPercentiles(
+  playerName: string,
+  propMarket: string,
+  propLine: number,
+  teamAbbr: string
+): { score: number; seasonAvg: number; consistency: number; details: string[] } | null {
+  const market = PERCENTILE_STAT_BY_MARKET[propMarket];
+  if (!market) return null;
+  const ranked = getPlayerPercentiles(playerName, teamAbbr, 'season');
+  const seasonAvg = ranked?.stats[market.stat];
+  if (!ranked || seasonAvg == null) return null;
+  
+  const details: string[] = [];
+  const digits = market.stat === 'passing_tds_pg' ? 2 : 1;
+  details.push(`Season Avg: ${seasonAvg.toFixed(digits)} ${market.label}/game`);
+  
+  const recent = getPlayerPercentiles(playerName, teamAbbr, 'last_3');
+  const recentAvg = recent?.stats[market.stat];
+  if (recentAvg != null) {
+    details.push(`Last 3 Avg: ${recentAvg.toFixed(digits)} ${market.label}/game`);
+  }
+  
+  const seasonPct = ranked.percentiles[market.stat];
+  if (seasonPct != null) {
+    const recentPct = recent?.percentiles[market.stat];
+    details.push(`League Percentile (${ranked.position}): ${seasonPct.toFixed(0)} season${recentPct != null ? `, ${recentPct.toFixed(0)} last 3` : ''} (${percentileTier(seasonPct)})`);
+  }
+  
+  const cutoff = percentileCutoffCache.get(`season:${ranked.position}:${market.stat}`);
+  if (cutoff?.elite_min != null && cutoff.starter_min != null) {
+    details.push(`Tier Cuts: elite ${cutoff.elite_min.toFixed(digits)}, starter ${cutoff.starter_min.toFixed(digits)} ${market.label}/game`);
+  }
+  
+  // Consistency: league percentile of the position's efficiency stats (50 = median)
+  const efficiency = (CONSISTENCY_STATS[ranked.position] || [])
+    .map(stat => ranked.percentiles[stat])
+    .filter((pct): pct is number => pct != null);
+  const consistency = efficiency.length > 0
+    ? efficiency.reduce((sum, pct) => sum + pct, 0) / efficiency.length
+    : 50;
+  details.push(`Consistency: ${consistency.toFixed(1)} (efficiency percentile)`);
+  
+  return finishPlayerStatsScore(seasonAvg, ranked.games, consistency, propLine, details);
+}
+
+/**
+ * Combine a player's average, consistency and sample size into the stats score
+ */
+function finishPlayerStatsScore(
+  seasonAvg: number,
+  gamesPlayed: number,
+  consistency: number,
+  propLine: number,
+  details: string[]
+): { score: number; seasonAvg: number; consistency: number; details: string[] } {
+  // Calculate score based on how player's average compares to the line
+  let performanceScore = 50; // Neutral baseline
+  
+  if (seasonAvg > 0) {
+    const diffFromLine = seasonAvg - propLine;
+    const percentAboveLine = (diffFromLine / propLine) * 100;
+    
+    // Score scales from 0-100 based on how far above/below line
+    // +20% above line = 80 score, -20% below line = 20 score
+    performanceScore = 50 + (percentAboveLine * 1.5);
+    performanceScore = Math.max(0, Math.min(100, performanceScore));
+    
+    details.push(`Performance vs Line: ${diffFromLine >= 0 ? '+' : ''}${diffFromLine.toFixed(1)} (${percentAboveLine >= 0 ? '+' : ''}${percentAboveLine.toFixed(1)}%)`);
+  }
+  
+  // Sample size confidence (more games = more reliable)
+  const sampleSizeConfidence = Math.min(100, (gamesPlayed / 8) * 100);
+  details.push(`Sample Size: ${gamesPlayed} games (${sampleSizeConfidence.toFixed(0)}% confidence)`);
+  
+  // Final player stats score: weighted average of performance and consistency
+  const finalScore = (performanceScore * 0.60) + (consistency * 0.30) + (sampleSizeConfidence * 0.10);
+  
+  return {
+    score: finalScore,
+    seasonAvg: seasonAvg,
+    consistency: consistency,
+    details: details
+  };
+}
+
 /**
  * Calculate Player Statistical Score (50% weight)
  * Based on season-to-date performance, consistency, and usage
@@ -239,6 +577,10 @@ async function calculatePlayerStatsScore(
   position: string,
   teamAbbr: string
 ): Promise<{ score: number; seasonAvg: number; consistency: number; details: string[] }> {
+  // Preloaded league percentiles answer this without any stat-table queries
+  const ranked = scoreFromPercentiles(playerName, propMarket, propLine, teamAbbr);
+  if (ranked) return ranked;
+  
   const supabase = getSupabaseClient();
   const details: string[] = [];
   
@@ -383,34 +725,7 @@ async function calculatePlayerStatsScore(
       }
     }
     
-    // Calculate score based on how player's average compares to the line
-    let performanceScore = 50; // Neutral baseline
-    
-    if (seasonAvg > 0) {
-      const diffFromLine = seasonAvg - propLine;
-      const percentAboveLine = (diffFromLine / propLine) * 100;
-      
-      // Score scales from 0-100 based on how far above/below line
-      // +20% above line = 80 score, -20% below line = 20 score
-      performanceScore = 50 + (percentAboveLine * 1.5);
-      performanceScore = Math.max(0, Math.min(100, performanceScore));
-      
-      details.push(`Performance vs Line: ${diffFromLine >= 0 ? '+' : ''}${diffFromLine.toFixed(1)} (${percentAboveLine >= 0 ? '+' : ''}${percentAboveLine.toFixed(1)}%)`);
-    }
-    
-    // Sample size confidence (more games = more reliable)
-    const sampleSizeConfidence = Math.min(100, (gamesPlayed / 8) * 100);
-    details.push(`Sample Size: ${gamesPlayed} games (${sampleSizeConfidence.toFixed(0)}% confidence)`);
-    
-    // Final player stats score: weighted average of performance and consistency
-    const finalScore = (performanceScore * 0.60) + (consistency * 0.30) + (sampleSizeConfidence * 0.10);
-    
-    return {
-      score: finalScore,
-      seasonAvg: seasonAvg,
-      consistency: consistency,
-      details: details
-    };
+    return finishPlayerStatsScore(seasonAvg, gamesPlayed, consistency, propLine, details);
   } catch (error) {
     console.error('Error calculating player stats score:', error);
     return {
@@ -423,7 +738,9 @@ async function calculatePlayerStatsScore(
 }
 
 /**
- * Detect if a player is elite based on efficiency metrics
+ * Detect if a player is elite for this prop: top-tier league percentile in the
+ * market's stat when percentiles are preloaded, otherwise efficiency thresholds
+ * on the season stat tables
  */
 async function isElitePlayer(
   playerName: string,
@@ -431,6 +748,15 @@ async function isElitePlayer(
   propMarket: string,
   teamAbbr: string
 ): Promise<boolean> {
+  const ranked = getPlayerPercentiles(playerName, teamAbbr, 'season');
+  if (ranked) {
+    // Elite in this market's stat, so a top receiver is not elite for rushing props;
+    // markets without a ranked stat (anytime TD) use the overall tier
+    const market = PERCENTILE_STAT_BY_MARKET[propMarket];
+    if (!market) return ranked.tier === 'elite';
+    return percentileTier(ranked.percentiles[market.stat]) === 'elite';
+  }
+  
   const supabase = getSupabaseClient();
   
   try {
@@ -492,6 +818,37 @@ async function isElitePlayer(
   }
 }
 
+/**
+ * Opponent's row from a defense_vs_* table, matched by full name or abbreviation.
+ * Served from the local table cache when it is running. Both paths use the same
+ * order and limit, so when name and abbreviation match different rows they
+ * agree on the most recently updated one.
+ */
+async function getDefenseVsPosition(
+  table: 'defense_vs_qb' | 'defense_vs_rb' | 'defense_vs_wr' | 'defense_vs_te',
+  opponentFullName: string,
+  opponentTeam: string
+): Promise<any | null> {
+  const cached = await cachedSelect(table, {
+    or: `(team_name.eq.${opponentFullName},team_abbr.eq.${opponentTeam})`,
+    season: 'eq.2025',
+    order: 'last_updated.desc,team_name.asc',
+    limit: '1',
+  });
+  if (cached) return cached[0] ?? null;
+  
+  const { data } = await getSupabaseClient()
+    .from(table)
+    .select('*')
+    .or(`team_name.eq.${opponentFullName},team_abbr.eq.${opponentTeam}`)
+    .eq('season', 2025)
+    .order('last_updated', { ascending: false })
+    .order('team_name', { ascending: true })
+    .limit(1)
+    .maybeSingle();
+  return data;
+}
+
 /**
  * Calculate Defensive Matchup Score (55% weight)
  * Based on opponent's defense vs that position
@@ -505,7 +862,6 @@ async function calculateDefensiveMatchupScore(
   playerName?: string,
   playerTeam?: string
 ): Promise<{ score: number; adjustment: number; details: string[] }> {
-  const supabase = getSupabaseClient();
   const details: string[] = [];
   
   try {
@@ -528,12 +884,7 @@ async function calculateDefensiveMatchupScore(
     
     // QB matchups - use defense_vs_qb table
     if (QB_MARKETS.includes(propMarket)) {
-      const { data: defStats } = await supabase
-        .from('defense_vs_qb')
-        .select('*')
-        .or(`team_name.eq.${opponentFullName},team_abbr.eq.${opponentTeam}`)
-        .eq('season', 2025)
-        .maybeSingle();
+      const defStats = await getDefenseVsPosition('defense_vs_qb', opponentFullName, opponentTeam);
       
       if (defStats) {
         const gamesPlayed = defStats.games_played || 1;
@@ -589,12 +940,7 @@ async function calculateDefensiveMatchupScore(
     
     // RB matchups - use defense_vs_rb table
     if (RB_MARKETS.includes(propMarket) && (position === 'RB' || position === 'FB')) {
-      const { data: defStats } = await supabase
-        .from('defense_vs_rb')
-        .select('*')
-        .or(`team_name.eq.${opponentFullName},team_abbr.eq.${opponentTeam}`)
-        .eq('season', 2025)
-        .maybeSingle();
+      const defStats = await getDefenseVsPosition('defense_vs_rb', opponentFullName, opponentTeam);
       
       if (defStats) {
         const gamesPlayed = defStats.games_played || 1;
@@ -640,12 +986,7 @@ async function calculateDefensiveMatchupScore(
     
     // WR matchups - use defense_vs_wr table
     if (WR_TE_MARKETS.includes(propMarket) && position === 'WR') {
-      const { data: defStats } = await supabase
-        .from('defense_vs_wr')
-        .select('*')
-        .or(`team_name.eq.${opponentFullName},team_abbr.eq.${opponentTeam}`)
-        .eq('season', 2025)
-        .maybeSingle();
+      const defStats = await getDefenseVsPosition('defense_vs_wr', opponentFullName, opponentTeam);
       
       if (defStats) {
         const gamesPlayed = defStats.games_played || 1;
@@ -680,12 +1021,7 @@ async function calculateDefensiveMatchupScore(
     
     // TE matchups - use defense_vs_te table
     if (WR_TE_MARKETS.includes(propMarket) && position === 'TE') {
-      const { data: defStats } = await supabase
-        .from('defense_vs_te')
-        .select('*')
-        .or(`team_name.eq.${opponentFullName},team_abbr.eq.${opponentTeam}`)
-        .eq('season', 2025)
-        .maybeSingle();
+      const defStats = await getDefenseVsPosition('defense_vs_te', opponentFullName, opponentTeam);
       
       if (defStats) {
         const gamesPlayed = defStats.games_played || 1;
@@ -761,16 +1097,27 @@ async function checkTeammateInjuries(
   try {
     // ALWAYS check snap counts to identify RB1/WR1 - this is critical for injury analysis
     // Use last 4 weeks to get better average (more data points)
-    const { data: snapCounts } = await supabase
-      .from('snap_counts')
-      .select('player_name, position, offensive_snap_pct, week_number')
-      .eq('team_abbr', playerTeam)
-      .eq('season', season)
-      .in('position', position === 'RB' ? ['RB'] : position === 'WR' ? ['WR'] : [])
-      .gte('week_number', Math.max(1, weekNumber - 4)) // Last 4 weeks for better average
-      .lte('week_number', weekNumber - 1) // Don't include current week
-      .order('week_number', { ascending: false })
-      .order('offensive_snap_pct', { ascending: false });
+    const snapPositions = position === 'RB' ? ['RB'] : position === 'WR' ? ['WR'] : [];
+    const cachedSnaps = await cachedSelect('snap_counts', {
+      team_abbr: `eq.${playerTeam}`,
+      season: `eq.${season}`,
+      position: `in.(${snapPositions.join(',')})`,
+      week_number: [`gte.${Math.max(1, weekNumber - 4)}`, `lte.${weekNumber - 1}`],
+      select: 'player_name,position,offensive_snap_pct,week_number',
+      order: 'week_number.desc,offensive_snap_pct.desc',
+    });
+    const { data: snapCounts } = cachedSnaps
+      ? { data: cachedSnaps }
+      : await supabase
+        .from('snap_counts')
+        .select('player_name, position, offensive_snap_pct, week_number')
+        .eq('team_abbr', playerTeam)
+        .eq('season', season)
+        .in('position', snapPositions)
+        .gte('week_number', Math.max(1, weekNumber - 4)) // Last 4 weeks for better average
+        .lte('week_number', weekNumber - 1) // Don't include current week
+        .order('week_number', { ascending: false })
+        .order('offensive_snap_pct', { ascending: false });
     
     // If no snap counts, still check injuries table directly as fallback
     if (!snapCounts || snapCounts.length === 0) {
@@ -1577,7 +1924,10 @@ export async function predictPlayerProp(prop: PlayerProp): Promise<PlayerPropPre
     }
     
     // Get player's team and position
-    const playerInfo = await getPlayerTeam(prop.player_name);
+    const playerInfo = await getPlayerTeam(
+      prop.player_name,
+      [TEAM_ABBR_MAP[prop.home_team], TEAM_ABBR_MAP[prop.away_team]]
+    );
     if (!playerInfo) {
       console.log(`Could not find team/position for ${prop.player_name}`);
       return null;
@@ -1781,6 +2131,10 @@ export async function generateAllPropPredictions(
     result.total = props.length;
     console.log(`📊 Analyzing ${props.length} player props...\n`);
     
+    // Resolve every player on the slate in one lookup
+    await preloadPlayerIdentities(props.map((p: any) => p.player_name));
+    await preloadPlayerPercentiles();
+    
     // Predict all props
     for (const prop of props) {
       try {
@@ -1,4 +1,5 @@
 import { createClient } from '@supabase/supabase-js';
+import { cachedSelect } from './tableCache';
 
 // Initialize Supabase client
 const getSupabaseClient = () => {
@@ -97,6 +98,15 @@ async function getTeamStats(teamName: string, week?: number, season?: number): P
   const supabase = getSupabaseClient();
   
   try {
+    const cached = await cachedSelect<TeamStats>('auto_nfl_team_stats', {
+      team_name: `eq.${teamName}`,
+      week: week ? `eq.${week}` : undefined,
+      season: season ? `eq.${season}` : undefined,
+      order: 'week.desc',
+      limit: '1',
+    });
+    if (cached) return cached[0] || null;
+    
     let query = supabase
       .from('auto_nfl_team_stats')
       .select('*')
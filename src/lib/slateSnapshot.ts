@@ -0,0 +1,120 @@
+import { gunzipSync } from 'zlib';
+import { createClient } from '@supabase/supabase-js';
+
+/**
+ * Precomputed weekly slate written by export_weekly_slate.py.
+ * Must match SLATE_SCHEMA_VERSION on the Python side.
+ */
+export const SLATE_SCHEMA_VERSION = 1;
+
+/**
+ * Cache header for responses served from a snapshot. The artifact only
+ * changes when the export stage reruns, so edge caches can hold it briefly.
+ */
+export const SLATE_CACHE_CONTROL = 'public, s-maxage=300, stale-while-revalidate=600';
+
+export interface SlateSnapshot {
+  schema_version: number;
+  week: number;
+  season: number;
+  generated_at: string;
+  spreads: any[];
+  totals: any[];
+  props: any[];
+}
+
+const getSupabaseClient = () => {
+  const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL!;
+  const supabaseServiceKey = process.env.SUPABASE_SERVICE_ROLE_KEY!;
+
+  if (!supabaseUrl || !supabaseServiceKey) {
+    throw new Error('Missing Supabase environment variables');
+  }
+
+  return createClient(supabaseUrl, supabaseServiceKey);
+};
+
+/**
+ * Prediction tables the exporter reads. A snapshot is only current while
+ * none of them has a row for its week updated after it was generated.
+ */
+const SLATE_SOURCE_TABLES = ['spread_predictions', 'totals_predictions', 'player_prop_predictions'];
+
+/**
+ * Newest updated_at across the slate's source tables for one week, or
+ * undefined when any lookup fails (freshness cannot be confirmed).
+ */
+async function getLatestPredictionUpdate(
+  supabase: ReturnType<typeof getSupabaseClient>,
+  week: number,
+  season: number
+): Promise<string | null | undefined> {
+  const results = await Promise.all(
+    SLATE_SOURCE_TABLES.map((table) =>
+      supabase
+        .from(table)
+        .select('updated_at')
+        .eq('week_number', week)
+        .eq('season', season)
+        .order('updated_at', { ascending: false })
+        .limit(1)
+        .maybeSingle()
+    )
+  );
+
+  let latest: string | null = null;
+  for (const { data, error } of results) {
+    if (error) return undefined;
+    const updatedAt = data?.updated_at as string | undefined;
+    if (updatedAt && (!latest || Date.parse(updatedAt) > Date.parse(latest))) {
+      latest = updatedAt;
+    }
+  }
+  return latest;
+}
+
+/**
+ * Load the precomputed slate for a week.
+ * Returns null when no snapshot exists, it was written by an incompatible
+ * exporter, or predictions for the week were regenerated after it was
+ * exported, so callers can fall back to live queries.
+ */
+export async function getSlateSnapshot(
+  week: number,
+  season?: number
+): Promise<SlateSnapshot | null> {
+  try {
+    const supabase = getSupabaseClient();
+
+    let query = supabase
+      .from('weekly_slate_snapshots')
+      .select('payload, schema_version, season, generated_at')
+      .eq('week', week);
+
+    if (season) query = query.eq('season', season);
+
+    const { data, error } = await query
+      .order('season', { ascending: false })
+      .limit(1)
+      .maybeSingle();
+
+    if (error || !data || data.schema_version !== SLATE_SCHEMA_VERSION) {
+      return null;
+    }
+
+    const latestUpdate = await getLatestPredictionUpdate(supabase, week, data.season as number);
+    if (
+      latestUpdate === undefined ||
+      (latestUpdate && Date.parse(latestUpdate) > Date.parse(data.generated_at as string))
+    ) {
+      console.log(`⚠️ Slate snapshot for week ${week} is stale (generated ${data.generated_at}), using live data`);
+      return null;
+    }
+
+    const json = gunzipSync(Buffer.from(data.payload as string, 'base64')).toString('utf-8');
+    return JSON.parse(json) as SlateSnapshot;
+  } catch (error) {
+    console.error('Error loading slate snapshot:', error);
+    return null;
+  }
+}
@@ -0,0 +1,36 @@
+/**
+ * Client for the local table cache (table_cache_service.py).
+ *
+ * When TABLE_CACHE_URL is set, hot lookups on auto_nfl_team_stats,
+ * team_defense_stats, snap_counts, injuries and defense_vs_* are answered
+ * from the in-memory cache instead of a Supabase round trip. Params use
+ * PostgREST syntax, e.g. { team_abbr: 'eq.KAN', order: 'week.desc', limit: '1' }.
+ *
+ * Returns null when the cache is not configured or unavailable so callers
+ * fall back to their Supabase query.
+ */
+
+const TABLE_CACHE_URL = process.env.TABLE_CACHE_URL;
+
+export async function cachedSelect<T = any>(
+  table: string,
+  params: Record<string, string | string[] | undefined>
+): Promise<T[] | null> {
+  if (!TABLE_CACHE_URL) return null;
+
+  const search = new URLSearchParams();
+  for (const [key, value] of Object.entries(params)) {
+    if (value === undefined) continue;
+    for (const v of Array.isArray(value) ? value : [value]) search.append(key, v);
+  }
+
+  try {
+    const response = await fetch(`${TABLE_CACHE_URL}/tables/${table}?${search.toString()}`, {
+      cache: 'no-store',
+    });
+    if (!response.ok) return null;
+    return (await response.json()) as T[];
+  } catch {
+    return null;
+  }
+}
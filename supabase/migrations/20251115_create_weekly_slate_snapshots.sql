@@ -0,0 +1,59 @@
+-- Create weekly_slate_snapshots table for precomputed best-bets payloads
+-- One row per week/season, written by export_weekly_slate.py after ingestion
+
+CREATE TABLE IF NOT EXISTS public.weekly_slate_snapshots (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+
+    -- Slate identification
+    week INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+
+    -- Artifact versioning
+    schema_version INTEGER NOT NULL DEFAULT 1,
+    content_hash TEXT NOT NULL, -- sha256 of the uncompressed JSON payload
+
+    -- Payload: base64-encoded gzip of the slate JSON
+    payload TEXT NOT NULL,
+
+    -- Counts for quick inspection without decompressing
+    spread_count INTEGER DEFAULT 0,
+    totals_count INTEGER DEFAULT 0,
+    props_count INTEGER DEFAULT 0,
+
+    -- Timestamps
+    generated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    -- Unique constraint: one snapshot per week/season
+    UNIQUE(week, season)
+);
+
+CREATE INDEX IF NOT EXISTS idx_weekly_slate_snapshots_week_season ON public.weekly_slate_snapshots(week, season);
+
+-- Enable Row Level Security
+ALTER TABLE public.weekly_slate_snapshots ENABLE ROW LEVEL SECURITY;
+
+-- Create policy to allow public read access
+CREATE POLICY "Allow public read access" ON public.weekly_slate_snapshots
+    FOR SELECT
+    USING (true);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_weekly_slate_snapshots_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_update_weekly_slate_snapshots_updated_at
+    BEFORE UPDATE ON public.weekly_slate_snapshots
+    FOR EACH ROW
+    EXECUTE FUNCTION update_weekly_slate_snapshots_updated_at();
+
+-- Add table comment
+COMMENT ON TABLE public.weekly_slate_snapshots IS 'Precomputed ranked spread, totals and prop picks served by the best-bets API routes';
+COMMENT ON COLUMN public.weekly_slate_snapshots.payload IS 'Base64-encoded gzip JSON: {spreads, totals, props} ranked and formatted for the API';
+COMMENT ON COLUMN public.weekly_slate_snapshots.schema_version IS 'Bumped when the payload layout changes; readers ignore unknown versions';
@@ -0,0 +1,57 @@
+-- Create player_identity_index table mapping player name aliases to one canonical id
+-- Built by player_identity_index.py from nfl_data_py and the PFR stat tables
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS public.player_identity_index (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+
+    -- Alias lookup
+    alias_key TEXT NOT NULL, -- normalized name, e.g. 'marvin harrison', 'dk metcalf', 'p mahomes'
+    alias_type TEXT NOT NULL CHECK (alias_type IN ('exact', 'suffix', 'initial')),
+    is_ambiguous BOOLEAN DEFAULT FALSE, -- alias maps to more than one player; disambiguate by team
+
+    -- Canonical player
+    canonical_id TEXT NOT NULL, -- nfl_data_py player_id (gsis), or 'pfr:<name>' for PFR-only players
+    player_name TEXT NOT NULL,
+    position TEXT,
+    team TEXT, -- current team (PFR abbreviation)
+    team_history TEXT[] DEFAULT '{}', -- chronological, PFR abbreviations
+    sources TEXT[] DEFAULT '{}',
+
+    -- Metadata
+    season INTEGER NOT NULL DEFAULT 2025,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    UNIQUE(alias_key, canonical_id)
+);
+
+-- Exact/bulk lookups and trigram fuzzy lookups on the alias key
+CREATE INDEX IF NOT EXISTS idx_player_identity_alias_key ON public.player_identity_index(alias_key);
+CREATE INDEX IF NOT EXISTS idx_player_identity_alias_trgm ON public.player_identity_index USING gin (alias_key gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_player_identity_canonical_id ON public.player_identity_index(canonical_id);
+
+-- Enable Row Level Security
+ALTER TABLE public.player_identity_index ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow public read access" ON public.player_identity_index
+    FOR SELECT
+    USING (true);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_player_identity_index_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_update_player_identity_index_updated_at
+    BEFORE UPDATE ON public.player_identity_index
+    FOR EACH ROW
+    EXECUTE FUNCTION update_player_identity_index_updated_at();
+
+COMMENT ON TABLE public.player_identity_index IS 'Normalized player name aliases resolved to a canonical player id with team history';
+COMMENT ON COLUMN public.player_identity_index.alias_key IS 'Lowercase, accent/punctuation-free name; suffixes (Jr, III) dropped for exact aliases';
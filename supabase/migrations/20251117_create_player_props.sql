@@ -0,0 +1,64 @@
+-- Create player_props table (current prop lines from The Odds API) if it does not exist yet
+-- Written by fetch_player_props.py and the scripts/fetch-*-props.ts scripts
+
+CREATE TABLE IF NOT EXISTS public.player_props (
+    id BIGSERIAL PRIMARY KEY,
+
+    -- Game identification
+    event_id TEXT NOT NULL, -- The Odds API event id (odds_bets.api_id)
+    sport_key TEXT,
+    sport_title TEXT,
+    commence_time TIMESTAMPTZ,
+    home_team TEXT,
+    away_team TEXT,
+
+    -- Prop
+    player_name TEXT NOT NULL,
+    prop_market TEXT NOT NULL, -- 'player_pass_yds', 'player_receptions', etc.
+    bookmaker_key TEXT,
+    bookmaker_title TEXT,
+    bet_type TEXT, -- 'Over', 'Under', or 'Yes' for anytime TD
+    line DECIMAL(6,1), -- null for anytime TD
+    odds INTEGER, -- American odds
+    last_update TIMESTAMPTZ,
+
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Bulk replace of a changed market deletes by event and market
+CREATE INDEX IF NOT EXISTS idx_player_props_event_market ON public.player_props(event_id, prop_market);
+CREATE INDEX IF NOT EXISTS idx_player_props_commence_time ON public.player_props(commence_time);
+
+-- Enable Row Level Security
+ALTER TABLE public.player_props ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access" ON public.player_props;
+CREATE POLICY "Allow public read access" ON public.player_props
+    FOR SELECT
+    USING (true);
+
+-- Replace an event's markets in one transaction so a failed insert never leaves them empty
+-- p_rows is a JSON array of player_props rows (without id/created_at)
+CREATE OR REPLACE FUNCTION replace_player_props(p_event_id TEXT, p_markets TEXT[], p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+  inserted INTEGER;
+BEGIN
+  DELETE FROM public.player_props
+  WHERE event_id = p_event_id AND prop_market = ANY(p_markets);
+
+  INSERT INTO public.player_props (
+    event_id, sport_key, sport_title, commence_time, home_team, away_team,
+    player_name, prop_market, bookmaker_key, bookmaker_title, bet_type, line, odds, last_update
+  )
+  SELECT
+    event_id, sport_key, sport_title, commence_time, home_team, away_team,
+    player_name, prop_market, bookmaker_key, bookmaker_title, bet_type, line, odds, last_update
+  FROM jsonb_populate_recordset(NULL::public.player_props, p_rows);
+
+  GET DIAGNOSTICS inserted = ROW_COUNT;
+  RETURN inserted;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE public.player_props IS 'Current player prop lines per event, market, bookmaker and outcome';
@@ -0,0 +1,18 @@
+-- Create player_props_sync_state table tracking per-event, per-market prop pulls
+-- Used by fetch_player_props.py to skip fresh or unchanged markets and save API credits
+
+CREATE TABLE IF NOT EXISTS public.player_props_sync_state (
+    event_id TEXT NOT NULL, -- The Odds API event id (odds_bets.api_id)
+    prop_market TEXT NOT NULL, -- 'player_pass_yds', 'player_receptions', etc.
+
+    last_pulled_at TIMESTAMPTZ NOT NULL,
+    content_hash TEXT NOT NULL, -- sha256 of the market's lines/prices at last pull
+
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (event_id, prop_market)
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_props_sync_state_event_id ON public.player_props_sync_state(event_id);
+
+COMMENT ON TABLE public.player_props_sync_state IS 'Last pull time and content hash per event/market for incremental player prop ingestion';
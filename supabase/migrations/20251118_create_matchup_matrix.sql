@@ -0,0 +1,57 @@
+-- Create matchup_matrix table holding precomputed home/away baseline terms
+-- Built by matchup_matrix.py from auto_nfl_team_stats (one row per ordered team pair)
+
+CREATE TABLE IF NOT EXISTS public.matchup_matrix (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+
+    -- Matchup
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL, -- stats as of this week
+    home_team TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    is_division_game BOOLEAN DEFAULT FALSE,
+
+    -- Totals baseline (mirrors predictTotals.ts)
+    base_total DECIMAL(5,2),
+    offensive_matchup_adjustment DECIMAL(5,2),
+    defensive_matchup_adjustment DECIMAL(5,2),
+    pace_adjustment DECIMAL(5,2),
+    competitiveness_adjustment DECIMAL(5,2),
+    srs_adjustment DECIMAL(5,2),
+    predicted_total DECIMAL(5,2),
+
+    -- Spread baseline (mirrors predictGames.ts), positive = home favored
+    expected_margin DECIMAL(5,2),
+    expected_margin_neutral DECIMAL(5,2), -- without home field advantage
+
+    -- Metadata
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    UNIQUE(season, week, home_team, away_team)
+);
+
+CREATE INDEX IF NOT EXISTS idx_matchup_matrix_season_week ON public.matchup_matrix(season, week);
+
+-- Enable Row Level Security
+ALTER TABLE public.matchup_matrix ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow public read access" ON public.matchup_matrix
+    FOR SELECT
+    USING (true);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_matchup_matrix_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_update_matchup_matrix_updated_at
+    BEFORE UPDATE ON public.matchup_matrix
+    FOR EACH ROW
+    EXECUTE FUNCTION update_matchup_matrix_updated_at();
+
+COMMENT ON TABLE public.matchup_matrix IS 'Precomputed spread and totals baselines for every home/away team pairing';
@@ -0,0 +1,147 @@
+-- Create odds_snapshots table: append-only history of spread, moneyline and total lines
+-- odds_bets and totals_odds are overwritten on every sync; these triggers keep every
+-- distinct line so clv_analyzer.py can look up the odds at bet time and at kickoff.
+-- Only DraftKings lines are recorded (the book the prediction routes use), picked by
+-- name rather than array position so a reordered bookmakers array never switches books
+
+CREATE TABLE IF NOT EXISTS public.odds_snapshots (
+    id BIGSERIAL PRIMARY KEY,
+
+    -- Game identification
+    game_id TEXT NOT NULL, -- The Odds API event id (odds_bets.api_id / totals_odds.game_id)
+    home_team TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    commence_time TIMESTAMPTZ NOT NULL,
+
+    -- Snapshot
+    source TEXT NOT NULL CHECK (source IN ('odds_bets', 'totals_odds')),
+    bookmaker TEXT NOT NULL, -- bookmaker title, e.g. 'DraftKings'
+    captured_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    -- Spreads and moneyline (from odds_bets)
+    home_spread DECIMAL(5,1),
+    home_spread_price INTEGER,
+    away_spread_price INTEGER,
+    home_ml_price INTEGER,
+    away_ml_price INTEGER,
+
+    -- Totals (from totals_odds)
+    total_line DECIMAL(5,1),
+    over_price INTEGER,
+    under_price INTEGER
+);
+
+-- As-of lookups read one game's snapshots in captured_at order
+CREATE INDEX IF NOT EXISTS idx_odds_snapshots_game_captured ON public.odds_snapshots(game_id, captured_at);
+CREATE INDEX IF NOT EXISTS idx_odds_snapshots_commence_time ON public.odds_snapshots(commence_time);
+
+-- Enable Row Level Security
+ALTER TABLE public.odds_snapshots ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow public read access" ON public.odds_snapshots
+    FOR SELECT
+    USING (true);
+
+-- The snapshot bookmaker's entry in a flattened odds_bets.bookmakers array (NULL if absent)
+CREATE OR REPLACE FUNCTION odds_snapshot_bookmaker(bookmakers JSONB)
+RETURNS JSONB AS $$
+  SELECT book
+  FROM jsonb_array_elements(CASE WHEN jsonb_typeof(bookmakers) = 'array' THEN bookmakers ELSE '[]'::JSONB END) AS book
+  WHERE book->>'bookmaker_name' = 'DraftKings'
+  LIMIT 1;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Record a snapshot whenever odds_bets gets new or changed DraftKings lines
+CREATE OR REPLACE FUNCTION record_odds_bets_snapshot()
+RETURNS TRIGGER AS $$
+DECLARE
+  book JSONB := odds_snapshot_bookmaker(NEW.bookmakers);
+BEGIN
+  IF book IS NULL THEN
+    RETURN NEW;
+  END IF;
+
+  IF TG_OP = 'UPDATE' AND odds_snapshot_bookmaker(OLD.bookmakers) IS NOT DISTINCT FROM book THEN
+    RETURN NEW;
+  END IF;
+
+  INSERT INTO public.odds_snapshots (
+    game_id, home_team, away_team, commence_time, source, bookmaker,
+    home_spread, home_spread_price, away_spread_price, home_ml_price, away_ml_price
+  ) VALUES (
+    NEW.api_id, NEW.home_team, NEW.away_team, NEW.commence_time, 'odds_bets',
+    book->>'bookmaker_name',
+    (book->>'spread_home_line')::DECIMAL,
+    (book->>'spread_home_price')::INTEGER,
+    (book->>'spread_away_price')::INTEGER,
+    (book->>'moneyline_home_price')::INTEGER,
+    (book->>'moneyline_away_price')::INTEGER
+  );
+
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_record_odds_bets_snapshot
+  AFTER INSERT OR UPDATE OF bookmakers ON odds_bets
+  FOR EACH ROW
+  EXECUTE FUNCTION record_odds_bets_snapshot();
+
+-- Record a snapshot whenever totals_odds gets a new or changed DraftKings total
+CREATE OR REPLACE FUNCTION record_totals_odds_snapshot()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.bookmaker IS DISTINCT FROM 'DraftKings' THEN
+    RETURN NEW;
+  END IF;
+
+  IF TG_OP = 'UPDATE'
+     AND OLD.over_line IS NOT DISTINCT FROM NEW.over_line
+     AND OLD.over_price IS NOT DISTINCT FROM NEW.over_price
+     AND OLD.under_price IS NOT DISTINCT FROM NEW.under_price THEN
+    RETURN NEW;
+  END IF;
+
+  INSERT INTO public.odds_snapshots (
+    game_id, home_team, away_team, commence_time, source, bookmaker,
+    total_line, over_price, under_price
+  ) VALUES (
+    NEW.game_id, NEW.home_team, NEW.away_team, NEW.commence_time, 'totals_odds', NEW.bookmaker,
+    NEW.over_line, NEW.over_price, NEW.under_price
+  );
+
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_record_totals_odds_snapshot
+  AFTER INSERT OR UPDATE ON public.totals_odds
+  FOR EACH ROW
+  EXECUTE FUNCTION record_totals_odds_snapshot();
+
+-- Seed history with the current lines so existing games have at least one snapshot
+INSERT INTO public.odds_snapshots (
+  game_id, home_team, away_team, commence_time, source, bookmaker, captured_at,
+  home_spread, home_spread_price, away_spread_price, home_ml_price, away_ml_price
+)
+SELECT
+  api_id, home_team, away_team, commence_time, 'odds_bets', book->>'bookmaker_name', COALESCE(updated_at, NOW()),
+  (book->>'spread_home_line')::DECIMAL,
+  (book->>'spread_home_price')::INTEGER,
+  (book->>'spread_away_price')::INTEGER,
+  (book->>'moneyline_home_price')::INTEGER,
+  (book->>'moneyline_away_price')::INTEGER
+FROM (SELECT *, odds_snapshot_bookmaker(bookmakers) AS book FROM odds_bets) AS games
+WHERE book IS NOT NULL;
+
+INSERT INTO public.odds_snapshots (
+  game_id, home_team, away_team, commence_time, source, bookmaker, captured_at,
+  total_line, over_price, under_price
+)
+SELECT game_id, home_team, away_team, commence_time, 'totals_odds', bookmaker, last_update,
+       over_line, over_price, under_price
+FROM public.totals_odds
+WHERE bookmaker = 'DraftKings';
+
+COMMENT ON TABLE public.odds_snapshots IS 'Append-only history of synced game lines, one row per distinct line per sync';
+COMMENT ON COLUMN public.odds_snapshots.home_spread IS 'Home team spread (negative = home favored); away spread is the negation';
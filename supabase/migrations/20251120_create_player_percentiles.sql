@@ -0,0 +1,88 @@
+-- Create player_percentiles and player_percentile_cutoffs: league percentile ranks, tiers
+-- and tier cut points per position
+-- Built by player_stats_loader.py on every refresh
+
+CREATE TABLE IF NOT EXISTS public.player_percentiles (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+
+    -- Player (player_id is the gsis id, same as player_identity_index.canonical_id)
+    player_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    stat_window TEXT NOT NULL CHECK (stat_window IN ('season', 'last_3', 'last_5')),
+    player_name TEXT,
+    position TEXT NOT NULL,
+    team TEXT,
+    games INTEGER,
+
+    -- Per-game and efficiency values, and their 0-100 percentile within the position
+    stats JSONB,
+    percentiles JSONB,
+
+    -- Tier from the composite of the position's key stats
+    composite_percentile DECIMAL(4,1),
+    tier TEXT NOT NULL CHECK (tier IN ('elite', 'starter', 'rotation', 'depth')),
+
+    -- Metadata
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    UNIQUE(player_id, season, stat_window)
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_percentiles_position_tier ON public.player_percentiles(season, stat_window, position, tier);
+
+-- Enable Row Level Security
+ALTER TABLE public.player_percentiles ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow public read access" ON public.player_percentiles
+    FOR SELECT
+    USING (true);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_player_percentiles_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_update_player_percentiles_updated_at
+    BEFORE UPDATE ON public.player_percentiles
+    FOR EACH ROW
+    EXECUTE FUNCTION update_player_percentiles_updated_at();
+
+-- Stat value at which each tier starts among qualified players, per position and window
+CREATE TABLE IF NOT EXISTS public.player_percentile_cutoffs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+
+    season INTEGER NOT NULL,
+    stat_window TEXT NOT NULL CHECK (stat_window IN ('season', 'last_3', 'last_5')),
+    position TEXT NOT NULL,
+    stat TEXT NOT NULL, -- key in player_percentiles.stats, e.g. 'receiving_yards_pg'
+
+    elite_min DECIMAL(7,2), -- 90th percentile
+    starter_min DECIMAL(7,2), -- 60th percentile
+    rotation_min DECIMAL(7,2), -- 30th percentile
+
+    -- Metadata
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    UNIQUE(season, stat_window, position, stat)
+);
+
+ALTER TABLE public.player_percentile_cutoffs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow public read access" ON public.player_percentile_cutoffs
+    FOR SELECT
+    USING (true);
+
+CREATE TRIGGER trigger_update_player_percentile_cutoffs_updated_at
+    BEFORE UPDATE ON public.player_percentile_cutoffs
+    FOR EACH ROW
+    EXECUTE FUNCTION update_player_percentiles_updated_at();
+
+COMMENT ON TABLE public.player_percentiles IS 'Per-position league percentiles and tiers for season-to-date and recent-form windows';
+COMMENT ON COLUMN public.player_percentiles.stat_window IS 'season = season to date; last_N = player''s last N games played';
+COMMENT ON TABLE public.player_percentile_cutoffs IS 'Per-position stat values at which the elite, starter and rotation tiers start';
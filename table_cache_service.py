@@ -0,0 +1,391 @@
+"""
+Local read-through cache for the small, slowly changing Supabase tables.
+
+Prediction runs read auto_nfl_team_stats, team_defense_stats, snap_counts,
+injuries and the defense_vs_* tables hundreds of times with the same filters.
+This service keeps each table in memory and answers filtered lookups over
+local HTTP, so a batch run pays one Supabase load per table instead of one
+round trip per query.
+
+Lookups use a subset of the PostgREST query syntax the TS code already speaks:
+
+    GET /tables/snap_counts?team_abbr=eq.KAN&position=in.(RB,WR)&week_number=gte.6
+        &order=week_number.desc,offensive_snap_pct.desc&limit=20&select=player_name,week_number
+    GET /tables/defense_vs_qb?or=(team_name.eq.Buffalo Bills,team_abbr.eq.BUF)&season=eq.2025
+
+Supported operators: eq, neq, gt, gte, lt, lte, in, is (null/true/false), and
+a not. prefix on any of them. A table is reloaded on the first request after
+its TTL expires or after it is invalidated:
+
+    POST /invalidate?table=injuries&table=snap_counts   (no table = all)
+    GET  /health
+
+Loaders call invalidate_cache() when they finish writing. The TS side uses
+the cache only when TABLE_CACHE_URL is set (see src/lib/tableCache.ts).
+
+Usage:
+    python table_cache_service.py                 # serve on TABLE_CACHE_PORT (8765)
+    python table_cache_service.py --ttl 300 --no-preload
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.error import URLError
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import Request, urlopen
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHED_TABLES = [
+    'auto_nfl_team_stats',
+    'team_defense_stats',
+    'snap_counts',
+    'injuries',
+    'defense_vs_qb',
+    'defense_vs_rb',
+    'defense_vs_wr',
+    'defense_vs_te',
+]
+
+DEFAULT_TTL_SECONDS = int(os.getenv('TABLE_CACHE_TTL_SECONDS', '600'))
+DEFAULT_PORT = int(os.getenv('TABLE_CACHE_PORT', '8765'))
+
+PAGE_SIZE = 1000
+
+Row = Dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+
+def invalidate_cache(tables: Optional[Iterable[str]] = None) -> bool:
+    """Ask a running cache service to drop tables (all if None).
+
+    No-op unless TABLE_CACHE_URL is set; a cache that is not running is not
+    an error for the loader that calls this.
+    """
+    base_url = os.getenv('TABLE_CACHE_URL')
+    if not base_url:
+        return False
+    query = urlencode([('table', t) for t in tables or []])
+    try:
+        with urlopen(Request(f"{base_url.rstrip('/')}/invalidate?{query}", method='POST'), timeout=5) as response:
+            return response.status == 200
+    except (URLError, OSError) as e:
+        print(f"⚠️  Cache invalidation skipped: {e}")
+        return False
+
+
+def get_supabase_client():
+    """Initialize Supabase client"""
+    from supabase import create_client
+
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+    if not url or not key:
+        raise Exception('Missing Supabase credentials in .env file')
+
+    return create_client(url, key)
+
+
+# ---------------------------------------------------------------------------
+# PostgREST-style filtering
+# ---------------------------------------------------------------------------
+
+def normalize(value: Any) -> str:
+    """Render a row value the way it appears in a query string."""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def as_number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def compare(row_value: Any, op: str, operand: str) -> bool:
+    if op == 'is':
+        return normalize(row_value) == operand.lower()
+    if row_value is None:
+        return False
+    if op == 'eq':
+        return normalize(row_value) == operand
+    if op == 'neq':
+        return normalize(row_value) != operand
+    if op == 'in':
+        return normalize(row_value) in split_list(operand)
+
+    left, right = as_number(row_value), as_number(operand)
+    if left is None or right is None:
+        left, right = normalize(row_value), operand
+    if op == 'gt':
+        return left > right
+    if op == 'gte':
+        return left >= right
+    if op == 'lt':
+        return left < right
+    if op == 'lte':
+        return left <= right
+    raise ValueError(f"Unsupported operator '{op}'")
+
+
+def split_list(value: str) -> List[str]:
+    """'(a,"b c",d)' -> ['a', 'b c', 'd']"""
+    inner = value.strip()
+    if inner.startswith('(') and inner.endswith(')'):
+        inner = inner[1:-1]
+    return [part.strip().strip('"') for part in inner.split(',') if part.strip()]
+
+
+def parse_condition(column: str, expression: str) -> Tuple[str, str, str, bool]:
+    """('week', 'not.gte.5') -> ('week', 'gte', '5', True)"""
+    negate = expression.startswith('not.')
+    if negate:
+        expression = expression[4:]
+    op, _, operand = expression.partition('.')
+    if op not in ('eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'in', 'is'):
+        raise ValueError(f"Unsupported filter '{column}={expression}'")
+    return column, op, operand.strip('"'), negate
+
+
+def condition_predicate(column: str, op: str, operand: str, negate: bool) -> Predicate:
+    return lambda row: compare(row.get(column), op, operand) != negate
+
+
+def parse_or(expression: str) -> Predicate:
+    """'(team_name.eq.X,team_abbr.eq.Y)' -> row matches any condition"""
+    predicates = []
+    for part in split_list(expression):
+        column, _, rest = part.partition('.')
+        predicates.append(condition_predicate(*parse_condition(column, rest)))
+    return lambda row: any(p(row) for p in predicates)
+
+
+def sort_rows(rows: List[Row], order: str) -> List[Row]:
+    """Apply 'a.desc,b' ordering with Postgres null placement (nulls last asc, first desc)."""
+    for term in reversed([t for t in order.split(',') if t]):
+        column, _, direction = term.partition('.')
+        descending = direction.startswith('desc')
+        rows = sorted(
+            rows,
+            key=lambda row: (row.get(column) is None, row.get(column) if row.get(column) is not None else 0),
+            reverse=descending,
+        )
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class CachedTable:
+    """One table's rows plus lazily built equality indexes."""
+
+    def __init__(self, name: str, loader: Callable[[str], List[Row]], ttl_seconds: int) -> None:
+        self.name = name
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.rows: List[Row] = []
+        self.indexes: Dict[str, Dict[str, List[int]]] = {}
+        self.loaded_at: Optional[float] = None
+        self.hits = 0
+        self.loads = 0
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.loaded_at = None
+
+    def _ensure_fresh(self) -> None:
+        # Caller holds self.lock
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl_seconds:
+            return
+        self.rows = self.loader(self.name)
+        self.indexes = {}
+        self.loaded_at = time.monotonic()
+        self.loads += 1
+
+    def _index(self, column: str) -> Dict[str, List[int]]:
+        index = self.indexes.get(column)
+        if index is None:
+            index = {}
+            for i, row in enumerate(self.rows):
+                index.setdefault(normalize(row.get(column)), []).append(i)
+            self.indexes[column] = index
+        return index
+
+    def query(self, params: Dict[str, List[str]]) -> List[Row]:
+        """Rows matching PostgREST-style params."""
+        conditions = []
+        predicates: List[Predicate] = []
+        for column, values in params.items():
+            if column in ('select', 'order', 'limit', 'offset'):
+                continue
+            for value in values:
+                if column == 'or':
+                    predicates.append(parse_or(value))
+                else:
+                    condition = parse_condition(column, value)
+                    conditions.append(condition)
+                    predicates.append(condition_predicate(*condition))
+
+        with self.lock:
+            self._ensure_fresh()
+            self.hits += 1
+            # Narrow with the first equality filter's index, then scan the rest
+            equality = next((c for c in conditions if c[1] == 'eq' and not c[3]), None)
+            if equality:
+                candidates = [self.rows[i] for i in self._index(equality[0]).get(equality[2], [])]
+            else:
+                candidates = self.rows
+            rows = [row for row in candidates if all(p(row) for p in predicates)]
+
+        if 'order' in params:
+            rows = sort_rows(rows, params['order'][0])
+        offset = int(params.get('offset', ['0'])[0])
+        if 'limit' in params:
+            rows = rows[offset : offset + int(params['limit'][0])]
+        elif offset:
+            rows = rows[offset:]
+        if 'select' in params and params['select'][0] != '*':
+            columns = [c.strip() for c in params['select'][0].split(',')]
+            rows = [{c: row.get(c) for c in columns} for row in rows]
+        return rows
+
+    def status(self) -> Dict[str, Any]:
+        age = None if self.loaded_at is None else round(time.monotonic() - self.loaded_at, 1)
+        return {'rows': len(self.rows), 'age_seconds': age, 'loads': self.loads, 'hits': self.hits}
+
+
+class TableCache:
+    def __init__(self, loader: Callable[[str], List[Row]], ttl_seconds: int, tables: List[str] = CACHED_TABLES) -> None:
+        self.tables = {name: CachedTable(name, loader, ttl_seconds) for name in tables}
+
+    def preload(self) -> None:
+        for name, table in self.tables.items():
+            try:
+                table.query({})
+                print(f"  ✅ {name}: {len(table.rows)} rows")
+            except Exception as e:
+                print(f"  ❌ {name}: {e}")
+
+    def invalidate(self, names: Optional[List[str]] = None) -> List[str]:
+        targets = names or list(self.tables)
+        for name in targets:
+            if name in self.tables:
+                self.tables[name].invalidate()
+        return [name for name in targets if name in self.tables]
+
+
+def supabase_loader() -> Callable[[str], List[Row]]:
+    client = get_supabase_client()
+
+    def load(table: str) -> List[Row]:
+        rows: List[Row] = []
+        start = 0
+        while True:
+            page = client.table(table).select('*').range(start, start + PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            start += PAGE_SIZE
+
+    return load
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+def make_handler(cache: TableCache):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: Any) -> None:
+            body = json.dumps(payload, default=str).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            if url.path == '/health':
+                self._send(200, {name: t.status() for name, t in cache.tables.items()})
+                return
+
+            parts = url.path.strip('/').split('/')
+            if len(parts) != 2 or parts[0] != 'tables':
+                self._send(404, {'error': 'not found'})
+                return
+            table = cache.tables.get(parts[1])
+            if table is None:
+                self._send(404, {'error': f"table '{parts[1]}' is not cached"})
+                return
+            try:
+                self._send(200, table.query(parse_qs(url.query)))
+            except ValueError as e:
+                self._send(400, {'error': str(e)})
+            except Exception as e:
+                self._send(502, {'error': f"load failed: {e}"})
+
+        def do_POST(self) -> None:
+            url = urlparse(self.path)
+            if url.path != '/invalidate':
+                self._send(404, {'error': 'not found'})
+                return
+            invalidated = cache.invalidate(parse_qs(url.query).get('table'))
+            print(f"  🔄 Invalidated: {', '.join(invalidated)}")
+            self._send(200, {'invalidated': invalidated})
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Per-request logging would drown out load/invalidate messages
+            pass
+
+    return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Local read-through cache for hot Supabase tables')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--ttl', type=int, default=DEFAULT_TTL_SECONDS, help='Seconds before a table is reloaded')
+    parser.add_argument('--no-preload', action='store_true', help='Load tables on first request instead of at startup')
+    args = parser.parse_args(argv)
+
+    try:
+        cache = TableCache(supabase_loader(), args.ttl)
+    except Exception as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"\n{'='*80}")
+    print(f"Table cache - {len(cache.tables)} tables, TTL {args.ttl}s")
+    print(f"{'='*80}\n")
+    if not args.no_preload:
+        cache.preload()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(cache))
+    print(f"\nServing on http://{args.host}:{args.port}  (set TABLE_CACHE_URL to use it)\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
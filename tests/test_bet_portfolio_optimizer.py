@@ -0,0 +1,67 @@
+"""bet_portfolio_optimizer.py: fractional-Kelly sizing and same-game exposure."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import bet_portfolio_optimizer as opt
+
+
+def candidate(kind, game, team, confidence, price=-110, player=None, opponent=None):
+    return {'kind': kind, 'label': f'{kind} {team} {player or ""}'.strip(), 'game': game, 'team': team,
+            'opponent': opponent, 'player': player, 'confidence': confidence, 'price': price}
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=opt.CANDIDATE_COLUMNS)
+
+
+def test_single_bet_stakes_fractional_kelly_below_the_cap():
+    result = opt.optimize_portfolio(frame([candidate('spread', 'DEN@KAN', 'KAN', 60, opponent='DEN')]))
+
+    p = 0.5 + 10 * opt.CONFIDENCE_SLOPE
+    b = 100 / 110
+    full_kelly = (p * (b + 1) - 1) / ((b + 1) ** 2 * p * (1 - p))
+    assert opt.KELLY_FRACTION * full_kelly < opt.MAX_BET_FRACTION
+    assert result.loc[0, 'stake_fraction'] == pytest.approx(opt.KELLY_FRACTION * full_kelly, abs=1e-4)
+
+
+def test_stake_is_capped_per_bet_and_negative_edges_get_nothing():
+    result = opt.optimize_portfolio(frame([
+        candidate('spread', 'DEN@KAN', 'KAN', 80, opponent='DEN'),
+        candidate('spread', 'BUF@MIA', 'MIA', 52, opponent='BUF'),
+    ])).set_index('team')
+
+    assert result.loc['KAN', 'stake_fraction'] == pytest.approx(opt.MAX_BET_FRACTION)
+    assert result.loc['MIA', 'expected_return'] < 0
+    assert result.loc['MIA', 'stake_fraction'] == 0
+
+
+def test_same_game_bets_share_the_game_exposure_cap():
+    same_game = [
+        candidate('spread', 'DEN@KAN', 'KAN', 80, opponent='DEN'),
+        candidate('total', 'DEN@KAN', 'KAN', 80, opponent='DEN'),
+        candidate('prop', 'DEN@KAN', 'KAN', 80, player='Travis Kelce'),
+        candidate('prop', 'DEN@KAN', 'DEN', 80, player='Bo Nix'),
+        candidate('prop', 'DEN@KAN', 'KAN', 80, player='Patrick Mahomes'),
+    ]
+    result = opt.optimize_portfolio(frame(same_game))
+
+    assert result['stake_fraction'].sum() <= opt.MAX_GAME_EXPOSURE + 1e-9
+    assert (result['stake_fraction'] > 0).all()
+
+
+def test_correlated_same_game_bets_are_sized_down():
+    alone = opt.optimize_portfolio(frame([
+        candidate('prop', 'DEN@KAN', 'KAN', 62, player='Travis Kelce'),
+    ]))
+    together = opt.optimize_portfolio(frame([
+        candidate('prop', 'DEN@KAN', 'KAN', 62, player='Travis Kelce'),
+        candidate('prop', 'DEN@KAN', 'KAN', 62, player='Travis Kelce'),
+    ]))
+
+    # Two props on one player are highly correlated: combined stake stays well under twice one bet
+    single = alone.loc[0, 'stake_fraction']
+    assert single < opt.MAX_BET_FRACTION
+    assert together['stake_fraction'].sum() < 1.5 * single
+    assert np.allclose(together['stake_fraction'], together.loc[0, 'stake_fraction'])
@@ -0,0 +1,34 @@
+"""clv_analyzer.py: as-of line matching stays on one bookmaker."""
+
+import numpy as np
+import pandas as pd
+
+import clv_analyzer as clv
+
+
+def snapshot(captured_at, bookmaker, home_spread):
+    row = dict.fromkeys(clv.SNAPSHOT_COLUMNS, np.nan)
+    row.update(game_id='g1', captured_at=pd.Timestamp(captured_at, tz='UTC'), bookmaker=bookmaker,
+               home_spread=home_spread, home_spread_price=-110, away_spread_price=-110)
+    return row
+
+
+def test_attach_lines_ignores_other_bookmakers():
+    snapshots = pd.DataFrame([
+        snapshot('2025-11-14 12:00', 'DraftKings', -3.0),
+        snapshot('2025-11-15 12:00', 'FanDuel', -6.5),
+        snapshot('2025-11-16 12:00', 'DraftKings', -4.5),
+        snapshot('2025-11-16 17:00', 'FanDuel', -1.0),
+    ])
+    picks = pd.DataFrame([{
+        'model': 'spread_model', 'market': 'spread', 'game_id': 'g1', 'home_team': 'KAN', 'away_team': 'DEN',
+        'commence_time': pd.Timestamp('2025-11-16 18:00', tz='UTC'), 'week': 11, 'season': 2025,
+        'side': 1, 'confidence': 70.0, 'bet_time': pd.Timestamp('2025-11-15 18:00', tz='UTC'),
+        'recorded_line': -3.0, 'recorded_price': -110,
+    }], columns=clv.PICK_COLUMNS)
+
+    with_bet = clv.attach_lines(picks, snapshots, 'bet_time', 'bet_')
+    with_close = clv.attach_lines(with_bet, snapshots, 'commence_time', 'close_')
+
+    assert with_close.loc[0, 'bet_line'] == -3.0
+    assert with_close.loc[0, 'close_line'] == -4.5
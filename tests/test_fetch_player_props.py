@@ -0,0 +1,255 @@
+"""fetch_player_props.py against a local mock of the Odds API event odds endpoint."""
+
+import asyncio
+import json
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import fetch_player_props as fpp
+
+NOW = datetime(2025, 11, 16, 12, 0, tzinfo=timezone.utc)
+ODDS_PATH = re.compile(r'^/v4/sports/americanfootball_nfl/events/([^/]+)/odds$')
+
+
+def event(api_id, kickoff_in):
+    return {
+        'api_id': api_id,
+        'home_team': f'Home {api_id}',
+        'away_team': f'Away {api_id}',
+        'commence_time': (NOW + kickoff_in).isoformat(),
+    }
+
+
+def odds_payload(event_id, markets, line=275.5):
+    return {
+        'id': event_id,
+        'sport_key': 'americanfootball_nfl',
+        'sport_title': 'NFL',
+        'commence_time': '2025-11-16T18:00:00Z',
+        'home_team': f'Home {event_id}',
+        'away_team': f'Away {event_id}',
+        'bookmakers': [{
+            'key': 'draftkings',
+            'title': 'DraftKings',
+            'markets': [{
+                'key': market,
+                'last_update': '2025-11-16T11:58:00Z',
+                'outcomes': [
+                    {'name': 'Over', 'description': 'Joe Burrow', 'point': line, 'price': -110},
+                    {'name': 'Under', 'description': 'Joe Burrow', 'point': line, 'price': -110},
+                ],
+            } for market in markets],
+        }],
+    }
+
+
+class MockOddsApi:
+    """Serves event odds and bills one credit per requested market."""
+
+    def __init__(self, remaining=500):
+        self.remaining = remaining
+        self.used = 0
+        self.requests = []
+        self.lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                match = ODDS_PATH.match(url.path)
+                if not match:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                markets = parse_qs(url.query)['markets'][0].split(',')
+                with api.lock:
+                    api.requests.append((match.group(1), markets))
+                    api.remaining -= len(markets)
+                    api.used += len(markets)
+                    headers = {
+                        'x-requests-remaining': str(api.remaining),
+                        'x-requests-used': str(api.used),
+                        'x-requests-last': str(len(markets)),
+                    }
+                body = json.dumps(odds_payload(match.group(1), markets)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+
+    def __getattr__(self, name):
+        # select/eq/gte/in_/order are filters the fake does not need to apply
+        return lambda *args, **kwargs: self
+
+    def upsert(self, rows, on_conflict=None):
+        self.client.upserts.append((self.table, rows, on_conflict))
+        return self
+
+    def execute(self):
+        return type('Response', (), {'data': self.client.tables.get(self.table, [])})()
+
+
+class FakeSupabase:
+    """Records writes; reads return the canned rows of each table."""
+
+    def __init__(self, tables=None):
+        self.tables = tables or {}
+        self.upserts = []
+        self.rpcs = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        self.rpcs.append((name, params))
+        return FakeQuery(self, name)
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    with MockOddsApi() as api:
+        monkeypatch.setattr(fpp, 'ODDS_API_BASE_URL', api.url)
+        yield api
+
+
+def state_row(event_id, market, pulled_ago, content_hash='stale'):
+    return {'event_id': event_id, 'prop_market': market,
+            'last_pulled_at': (NOW - pulled_ago).isoformat(), 'content_hash': content_hash}
+
+
+def run_ingest(client, monkeypatch, force=False):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return NOW
+
+    monkeypatch.setattr(fpp, 'datetime', FrozenDatetime)
+    return asyncio.run(fpp.ingest(client, 11, force))
+
+
+def test_plan_requests_refreshes_by_kickoff_and_orders_stalest_first():
+    soon = event('soon', timedelta(hours=2))       # 15 minute interval
+    later = event('later', timedelta(days=2))      # 6 hour interval
+    fresh = event('fresh', timedelta(days=2))
+    new = event('new', timedelta(days=5))          # never pulled
+    state = {}
+    for market in fpp.PROP_MARKETS:
+        state[('soon', market)] = state_row('soon', market, timedelta(minutes=20))
+        state[('later', market)] = state_row('later', market, timedelta(hours=7))
+        state[('fresh', market)] = state_row('fresh', market, timedelta(hours=1))
+
+    plan = fpp.plan_requests([soon, later, fresh, new], state, NOW)
+
+    assert [e['api_id'] for e, _ in plan] == ['new', 'soon', 'later']
+    assert all(markets == fpp.PROP_MARKETS for _, markets in plan)
+
+    forced = fpp.plan_requests([soon, later, fresh, new], state, NOW, force=True)
+    assert {e['api_id'] for e, _ in forced} == {'soon', 'later', 'fresh', 'new'}
+
+
+def test_plan_requests_only_asks_for_due_markets():
+    game = event('g1', timedelta(hours=12))        # 1 hour interval
+    state = {}
+    state[('g1', 'player_pass_yds')] = state_row('g1', 'player_pass_yds', timedelta(minutes=30))
+    state[('g1', 'player_pass_tds')] = state_row('g1', 'player_pass_tds', timedelta(hours=2))
+
+    [(_, markets)] = fpp.plan_requests([game], state, NOW)
+
+    assert 'player_pass_yds' not in markets
+    assert 'player_pass_tds' in markets
+    assert len(markets) == len(fpp.PROP_MARKETS) - 1
+
+
+def test_ingest_stops_at_quota_reserve(mock_api, monkeypatch):
+    mock_api.remaining = 60
+    monkeypatch.setattr(fpp, 'QUOTA_RESERVE', 50)
+    monkeypatch.setattr(fpp, 'MAX_CONCURRENT_REQUESTS', 1)
+    events = [event(f'g{i}', timedelta(hours=5 + i)) for i in range(3)]
+    client = FakeSupabase({'odds_bets': events, fpp.STATE_TABLE: []})
+
+    stats = run_ingest(client, monkeypatch)
+
+    # The first pull leaves 51 credits; another 9-market pull would dip below the reserve
+    assert [event_id for event_id, _ in mock_api.requests] == ['g0']
+    assert stats['requested'] == 3
+    assert stats['credits'] == len(fpp.PROP_MARKETS)
+    [(_, state_rows, _)] = client.upserts
+    assert {r['event_id'] for r in state_rows} == {'g0'}
+
+
+def test_ingest_skips_write_for_unchanged_market(mock_api, monkeypatch):
+    game = event('g1', timedelta(hours=2))
+    rows = fpp.parse_event_props(odds_payload('g1', ['player_pass_yds']))['player_pass_yds']
+    state = [state_row('g1', m, timedelta(hours=1)) for m in fpp.PROP_MARKETS]
+    state[0] = state_row('g1', 'player_pass_yds', timedelta(hours=1), fpp.market_hash(rows))
+    client = FakeSupabase({'odds_bets': [game], fpp.STATE_TABLE: state})
+
+    stats = run_ingest(client, monkeypatch)
+
+    # Every due market is still pulled (and billed); only the write is skipped
+    assert mock_api.requests == [('g1', fpp.PROP_MARKETS)]
+    assert stats['unchanged_markets'] == 1
+    assert stats['changed_markets'] == len(fpp.PROP_MARKETS) - 1
+    [(_, params)] = client.rpcs
+    assert 'player_pass_yds' not in params['p_markets']
+    [(_, state_rows, _)] = client.upserts
+    assert len(state_rows) == len(fpp.PROP_MARKETS)
+    assert all(r['last_pulled_at'] == NOW.isoformat() for r in state_rows)
+
+
+def test_write_changes_replaces_each_event_in_one_call():
+    client = FakeSupabase()
+    g1 = fpp.parse_event_props(odds_payload('g1', ['player_pass_yds', 'player_receptions']))
+    g2 = fpp.parse_event_props(odds_payload('g2', ['player_rush_yds']))
+    state_rows = [state_row('g1', 'player_pass_yds', timedelta(0), 'abc')]
+
+    written = fpp.write_changes(client, {'g1': g1, 'g2': g2}, state_rows)
+
+    assert written == 6
+    assert [(name, p['p_event_id'], p['p_markets']) for name, p in client.rpcs] == [
+        ('replace_player_props', 'g1', ['player_pass_yds', 'player_receptions']),
+        ('replace_player_props', 'g2', ['player_rush_yds']),
+    ]
+    assert all(row['event_id'] == 'g1' for row in client.rpcs[0][1]['p_rows'])
+    assert client.upserts == [(fpp.STATE_TABLE, state_rows, 'event_id,prop_market')]
+
+
+def test_write_changes_records_no_state_when_a_replace_fails():
+    class FailingSupabase(FakeSupabase):
+        def rpc(self, name, params):
+            raise RuntimeError('statement timeout')
+
+    client = FailingSupabase()
+    changed = {'g1': fpp.parse_event_props(odds_payload('g1', ['player_pass_yds']))}
+
+    with pytest.raises(RuntimeError):
+        fpp.write_changes(client, changed, [state_row('g1', 'player_pass_yds', timedelta(0))])
+    assert client.upserts == []
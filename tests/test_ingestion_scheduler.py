@@ -0,0 +1,58 @@
+"""ingestion_scheduler.py: replanning and the two-route odds job."""
+
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+import ingestion_scheduler as sched
+
+NOW = datetime(2025, 11, 13, 12, 0, tzinfo=timezone.utc)
+
+
+def window(kickoff):
+    return (kickoff, kickoff + sched.GAME_DURATION)
+
+
+def test_replan_picks_up_a_flexed_kickoff(monkeypatch):
+    original = NOW + timedelta(days=3, hours=5)
+    flexed = original + timedelta(hours=3, minutes=20)
+    windows = [window(original)]
+    queue = sched.build_plan(windows, NOW, NOW + sched.PLAN_HORIZON)
+    overdue = (NOW - timedelta(minutes=5), 'injuries')
+    queue.append(overdue)
+    monkeypatch.setattr(sched, 'load_game_windows', lambda season: [window(flexed)])
+
+    queue = sched.replan(queue, windows, 2025, NOW)
+
+    assert windows == [window(flexed)]
+    assert overdue in queue
+    assert (flexed - timedelta(minutes=45), 'odds') in queue
+    assert (original - timedelta(minutes=45), 'odds') not in queue
+
+
+def test_replan_keeps_previous_windows_when_the_schedule_fails(monkeypatch):
+    windows = [window(NOW + timedelta(days=1))]
+
+    def fail(season):
+        raise RuntimeError('offline')
+
+    monkeypatch.setattr(sched, 'load_game_windows', fail)
+    queue = sched.replan([], windows, 2025, NOW)
+
+    assert windows == [window(NOW + timedelta(days=1))]
+    assert any(name == 'odds' for _, name in queue)
+
+
+def test_odds_job_runs_totals_sync_when_spreads_sync_raises(monkeypatch):
+    called = []
+
+    def fake_call_api(path):
+        called.append(path)
+        if path == '/api/sync-odds':
+            raise requests.ConnectionError('refused')
+        return True
+
+    monkeypatch.setattr(sched, 'call_api', fake_call_api)
+
+    assert sched.JOBS['odds']['run']() is False
+    assert called == ['/api/sync-odds', '/api/sync-totals-odds']
@@ -0,0 +1,149 @@
+"""player_identity_index.py: multi-team PFR rows and stale alias pruning."""
+
+import pandas as pd
+
+import player_identity_index as pii
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.op = 'select'
+        self.ids = None
+        self.bounds = None
+
+    def select(self, *args):
+        return self
+
+    def eq(self, *args):
+        return self
+
+    def order(self, *args):
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.op = 'upsert'
+        self.rows = rows
+        return self
+
+    def delete(self):
+        self.op = 'delete'
+        return self
+
+    def in_(self, column, values):
+        self.ids = set(values)
+        return self
+
+    def execute(self):
+        rows = self.client.tables.setdefault(self.table, [])
+        if self.op == 'upsert':
+            existing = {(r['alias_key'], r['canonical_id']): r for r in rows}
+            for row in self.rows:
+                key = (row['alias_key'], row['canonical_id'])
+                if key in existing:
+                    existing[key].update(row)
+                else:
+                    rows.append(dict(row, id=len(rows) + 1000))
+            data = []
+        elif self.op == 'delete':
+            self.client.tables[self.table] = [r for r in rows if r['id'] not in self.ids]
+            data = []
+        else:
+            start, end = self.bounds or (0, len(rows))
+            data = rows[start : end + 1]
+        return type('Response', (), {'data': data})()
+
+
+class FakeSupabase:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def test_multi_team_rows_never_become_current_team(monkeypatch):
+    players = pd.DataFrame([{'player_id': '00-1', 'player_display_name': 'Jakobi Meyers',
+                             'player_name': 'J.Meyers', 'position': 'WR', 'teams': ['LVR']}])
+    monkeypatch.setattr(pii, 'load_nfl_data_players', lambda seasons: players)
+    client = FakeSupabase({
+        'player_passing_stats': [],
+        'player_rushing_stats': [],
+        'player_receiving_stats': [
+            {'player_name': 'Jakobi Meyers', 'team_abbr': 'JAX', 'position': 'WR'},
+            {'player_name': 'Jakobi Meyers', 'team_abbr': '2TM', 'position': 'WR'},
+        ],
+    })
+
+    index = pii.build_index(client, [2025])
+
+    assert index.players['00-1']['team_history'] == ['LVR', 'JAX']
+    assert {r['team'] for r in index.to_records(2025)} == {'JAX'}
+    assert index.resolve('Jakobi Meyers', '2TM') == '00-1'
+
+
+def test_upsert_index_prunes_aliases_missing_from_the_rebuild(monkeypatch):
+    monkeypatch.setattr(pii, 'PAGE_SIZE', 2)
+    stale = {'id': 1, 'alias_key': 'old name', 'canonical_id': '00-9', 'team': 'NYJ'}
+    kept = {'id': 2, 'alias_key': 'jakobi meyers', 'canonical_id': '00-1', 'team': 'LVR'}
+    client = FakeSupabase({pii.INDEX_TABLE: [stale, kept]})
+    records = [
+        {'alias_key': 'jakobi meyers', 'canonical_id': '00-1', 'team': 'JAX'},
+        {'alias_key': 'j meyers', 'canonical_id': '00-1', 'team': 'JAX'},
+    ]
+
+    pruned = pii.upsert_index(client, records)
+
+    assert pruned == 1
+    rows = client.tables[pii.INDEX_TABLE]
+    assert {(r['alias_key'], r['team']) for r in rows} == {('jakobi meyers', 'JAX'), ('j meyers', 'JAX')}
+
+
+def test_return_trade_keeps_the_latest_team_current():
+    index = pii.PlayerIdentityIndex()
+    index.add_player('00-1', 'Jamal Adams', 'S', ['SEA', 'NYJ', 'SEA'], 'nfl_data_py')
+    index.add_player('00-2', 'Jamal Adams', 'LB', ['NYJ'], 'nfl_data_py')
+
+    assert index.players['00-1']['team_history'] == ['SEA', 'NYJ', 'SEA']
+    assert index.resolve('Jamal Adams', 'SEA') == '00-1'
+    assert index.resolve('Jamal Adams', 'NYJ') == '00-2'
+
+
+def test_pfr_rows_do_not_reorder_a_return_trade(monkeypatch):
+    players = pd.DataFrame([{'player_id': '00-1', 'player_display_name': 'Courtland Sutton',
+                             'player_name': 'C.Sutton', 'position': 'WR', 'teams': ['DEN', 'NYJ', 'DEN']}])
+    monkeypatch.setattr(pii, 'load_nfl_data_players', lambda seasons: players)
+    client = FakeSupabase({
+        'player_passing_stats': [],
+        'player_rushing_stats': [],
+        'player_receiving_stats': [
+            {'player_name': 'Courtland Sutton', 'team_abbr': 'DEN', 'position': 'WR'},
+            {'player_name': 'Courtland Sutton', 'team_abbr': 'NYJ', 'position': 'WR'},
+        ],
+    })
+
+    index = pii.build_index(client, [2025])
+
+    assert index.players['00-1']['team_history'] == ['DEN', 'NYJ', 'DEN']
+
+
+def test_single_fuzzy_match_must_share_the_team():
+    index = pii.PlayerIdentityIndex()
+    index.add_player('00-1', 'Jaxon Smith-Njigba', 'WR', ['SEA'], 'nfl_data_py')
+
+    assert index.resolve('Jaxon Smith Njigbaa', 'SEA') == '00-1'
+    assert index.resolve('Jaxon Smith Njigbaa', 'DAL') is None
+    assert index.resolve('Jaxon Smith Njigbaa') == '00-1'
+
+
+def test_pfr_stat_tables_are_paged(monkeypatch):
+    monkeypatch.setattr(pii, 'PAGE_SIZE', 2)
+    rows = [{'player_name': f'Player {i}', 'team_abbr': 'KAN', 'position': 'WR'} for i in range(5)]
+    client = FakeSupabase({'player_passing_stats': [], 'player_rushing_stats': [], 'player_receiving_stats': rows})
+
+    assert pii.load_pfr_players(client, 2025) == rows